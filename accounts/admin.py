@@ -1,7 +1,22 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import LargeTableAdmin
 
 from .models import Institute, Profile
-admin.site.register(Institute)
-admin.site.register(Profile)
+
+
+@admin.register(Institute)
+class InstituteAdmin(admin.ModelAdmin):
+    list_display = ["code", "name", "db_alias", "created_at"]
+    search_fields = ["^code", "^name"]  # also backs the institute autocompletes
+    ordering = ["code"]
+
+
+@admin.register(Profile)
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ["user", "institute", "role", "created_at"]
+    list_select_related = ["user", "institute"]
+    list_filter = ["role"]
+    search_fields = ["^user__username"]
+    raw_id_fields = ["user"]
+    autocomplete_fields = ["institute"]
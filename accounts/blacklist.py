@@ -0,0 +1,157 @@
+"""
+In-memory negative lookup for the refresh-token blacklist.
+
+Every refresh used to run `BlacklistedToken.objects.filter(token__jti=...)`.
+BlacklistFilter keeps a Bloom filter of blacklisted jtis per process:
+"definitely not blacklisted" answers skip the database, and a possible
+hit (real or false positive) still falls through to the exact query.
+
+Freshness:
+- blacklisting a token adds it to the local filter and bumps a version
+  number in the cache, so other processes pull new rows (id > last seen)
+  on their next lookup;
+- that only works with a shared cache. With a process-local backend
+  (LocMemCache, DummyCache) the filter is bypassed and every lookup runs
+  the exact query, so a logout is never missed by another worker;
+- independently of the cache, a process re-syncs at least every
+  MAX_STALENESS seconds (in case the version key was evicted) and
+  rebuilds from scratch every REBUILD_INTERVAL seconds (which also drops
+  expired entries).
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+VERSION_KEY = "token-blacklist:version"
+
+# Rows are pulled incrementally by id. Ids are assigned at insert, not at
+# commit, so every pull looks back a little to catch rows from concurrent
+# transactions that committed out of order.
+ID_LOOKBACK = 100
+
+_DEFAULTS = {
+    "ENABLED": True,
+    "MAX_STALENESS": 30,
+    "REBUILD_INTERVAL": 3600,
+    "FALSE_POSITIVE_RATE": 0.01,
+}
+
+
+def _config(name):
+    return getattr(settings, "TOKEN_BLACKLIST_FILTER", {}).get(name, _DEFAULTS[name])
+
+
+def _shared_cache():
+    """Whether a version bump in `cache` is seen by the other processes."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1024)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.capacity = capacity
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_id = 0
+        self._version = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+
+    def _rows(self, after_id):
+        return (
+            BlacklistedToken.objects.filter(id__gt=after_id, token__expires_at__gt=timezone.now())
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+
+    def _rebuild(self, now):
+        # filled before it is swapped in: lookups that skip the lock keep
+        # using the old filter until then, never a half-built one
+        capacity = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).count()
+        bloom = BloomFilter(capacity * 2, _config("FALSE_POSITIVE_RATE"))
+        last_id = self._pull(bloom, 0)
+        self._bloom, self._last_id = bloom, last_id
+        self._built_at = now
+
+    def _pull(self, bloom, last_id):
+        """Add rows after `last_id` to `bloom`; returns the new last id."""
+        for row_id, jti in self._rows(max(last_id - ID_LOOKBACK, 0)).iterator(chunk_size=5000):
+            if row_id > last_id:
+                bloom.add(jti)
+                last_id = row_id
+            elif jti not in bloom:
+                bloom.add(jti)
+        return last_id
+
+    def _sync(self):
+        now = time.monotonic()
+        version = cache.get(VERSION_KEY)
+        fresh = (
+            self._bloom is not None
+            and version == self._version
+            and now - self._synced_at < _config("MAX_STALENESS")
+        )
+        if fresh:
+            return
+
+        with self._lock:
+            if (
+                self._bloom is None
+                or now - self._built_at > _config("REBUILD_INTERVAL")
+                or self._bloom.count > self._bloom.capacity
+            ):
+                self._rebuild(now)
+            else:
+                self._last_id = self._pull(self._bloom, self._last_id)
+            self._version = version
+            self._synced_at = now
+
+    def might_contain(self, jti):
+        if not _config("ENABLED") or not _shared_cache():
+            return True
+        self._sync()
+        return jti in self._bloom
+
+    def add(self, jti):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, int(time.time() * 1000), None)
+
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+
+blacklist_filter = BlacklistFilter()
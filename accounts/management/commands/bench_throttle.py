@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from core.throttling import IPTokenBucketThrottle
+
+
+class _View:
+    throttle_scope = "bench"
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request cost of a token-bucket throttle check against the configured cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20000, help="checks to time (default 20000)")
+        parser.add_argument("--clients", type=int, default=1000, help="distinct client IPs (default 1000)")
+
+    def handle(self, *args, **options):
+        # generous budget so every check takes the full allow path
+        api_settings.DEFAULT_THROTTLE_RATES["bench.ip"] = "1000000/s"
+        try:
+            factory = APIRequestFactory()
+            requests = [
+                factory.get("/", REMOTE_ADDR=f"10.0.{i // 256 % 256}.{i % 256}")
+                for i in range(options["clients"])
+            ]
+            view = _View()
+
+            start = time.perf_counter()
+            for i in range(options["requests"]):
+                IPTokenBucketThrottle().allow_request(requests[i % len(requests)], view)
+            elapsed = time.perf_counter() - start
+        finally:
+            del api_settings.DEFAULT_THROTTLE_RATES["bench.ip"]
+
+        self.stdout.write(
+            f"{options['requests']} checks in {elapsed * 1000:.1f} ms: "
+            f"{elapsed / options['requests'] * 1e6:.1f} µs per request"
+        )
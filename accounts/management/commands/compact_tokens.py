@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding tokens (and their blacklist rows) in small "
+        "primary-key windows, so the tables stop growing without long locks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="ids per window (default 5000)")
+        parser.add_argument("--sleep", type=float, default=0.0, help="pause between windows in seconds")
+        parser.add_argument("--dry-run", action="store_true", help="only count what would be deleted")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        now = timezone.now()
+
+        bounds = OutstandingToken.objects.aggregate(low=Min("id"), high=Max("id"))
+        if bounds["low"] is None:
+            self.stdout.write("No outstanding tokens.")
+            return
+
+        started = time.perf_counter()
+        outstanding_deleted = blacklisted_deleted = 0
+
+        # walk the table by primary key: expires_at has no index, but each
+        # window is a cheap range scan however large the table gets
+        for low in range(bounds["low"], bounds["high"] + 1, batch_size):
+            expired = OutstandingToken.objects.filter(
+                id__gte=low, id__lt=low + batch_size, expires_at__lte=now,
+            )
+
+            if options["dry_run"]:
+                outstanding_deleted += expired.count()
+                continue
+
+            with transaction.atomic():
+                _, per_model = expired.delete()
+            outstanding_deleted += per_model.get("token_blacklist.OutstandingToken", 0)
+            blacklisted_deleted += per_model.get("token_blacklist.BlacklistedToken", 0)
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        elapsed = time.perf_counter() - started
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {outstanding_deleted} expired outstanding tokens "
+            f"({blacklisted_deleted} blacklisted) in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,135 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from accounts.models import Institute, Profile
+from core.sharding import copy_rows, institute_lookup, mirror, tenant_models
+from marketplace.feed_cache import invalidate_feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Move one institute's marketplace / orders / issues / notifications rows "
+        "to another database alias. Rows are copied with their ids in FK order, "
+        "the institute is switched over, then the source rows are deleted. "
+        "Run it in a quiet window: the copy aborts if the source changes meanwhile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("code", help="institute code")
+        parser.add_argument("target", help="database alias to move to")
+        parser.add_argument("--batch-size", type=int, default=1000, help="rows per copy / delete batch (default 1000)")
+        parser.add_argument("--dry-run", action="store_true", help="only count the rows to move")
+
+    def handle(self, *args, **options):
+        institute = Institute.objects.filter(code=options["code"]).first()
+        if institute is None:
+            raise CommandError(f"Unknown institute code '{options['code']}'")
+
+        source, target = institute.db_alias, options["target"]
+        if target not in settings.DATABASES:
+            raise CommandError(f"'{target}' is not in DATABASES")
+        if target == source:
+            raise CommandError(f"{institute.code} already lives on '{target}'")
+
+        querysets = {}
+        for model in tenant_models():
+            lookup = institute_lookup(model)
+            if lookup is None:
+                self.stderr.write(f"Skipping {model._meta.label}: no path to an institute")
+                continue
+            querysets[model] = model._base_manager.using(source).filter(**{lookup: institute.pk})
+
+        if options["dry_run"]:
+            for model, queryset in querysets.items():
+                self.stdout.write(f"{model._meta.label}: {queryset.count()}")
+            return
+
+        started = time.perf_counter()
+        batch_size = options["batch_size"]
+
+        with transaction.atomic(using=target):
+            if target != DEFAULT_DB_ALIAS:
+                self.copy_members(institute, target, batch_size)
+
+            copied = {model: self.copy(model, queryset, target, batch_size) for model, queryset in querysets.items()}
+
+            # anything written to the source during the copy would be lost at the switch
+            for model, queryset in querysets.items():
+                if queryset.count() != copied[model]:
+                    raise CommandError(
+                        f"{model._meta.label} changed on '{source}' during the copy; nothing was moved."
+                    )
+
+        institute.db_alias = target
+        institute.save(update_fields=["db_alias"])
+        invalidate_feed(institute.pk)
+
+        for model, queryset in reversed(querysets.items()):
+            self.delete(model, queryset, source, batch_size)
+        if source != DEFAULT_DB_ALIAS:
+            self.delete_members(institute, source)
+
+        summary = ", ".join(f"{model._meta.label} {count}" for model, count in copied.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {institute.code} from '{source}' to '{target}' in {time.perf_counter() - started:.1f}s ({summary})."
+        ))
+
+    def copy(self, model, queryset, target, batch_size):
+        destination = model._base_manager.using(target)
+        queryset = queryset.order_by("pk")
+        last_pk, total = None, 0
+
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            objs = list(batch[:batch_size])
+            if not objs:
+                return total
+
+            pks = [obj.pk for obj in objs]
+            if destination.filter(pk__in=pks).exists():
+                raise CommandError(
+                    f"{model._meta.label} ids {pks[0]}..{pks[-1]} already exist on '{target}'; "
+                    "shards need disjoint id ranges."
+                )
+
+            copy_rows(model, objs, target)
+            last_pk = pks[-1]
+            total += len(objs)
+
+    def copy_members(self, institute, target, batch_size):
+        """Institute, User and Profile rows the tenant rows point at."""
+        mirror(institute, target)
+
+        profiles = list(Profile.objects.filter(institute=institute).order_by("pk"))
+        for start in range(0, len(profiles), batch_size):
+            batch = profiles[start:start + batch_size]
+            user_ids = [profile.user_id for profile in batch]
+
+            existing = set(User.objects.using(target).filter(pk__in=user_ids).values_list("pk", flat=True))
+            copy_rows(User, list(User.objects.filter(pk__in=set(user_ids) - existing)), target)
+
+            existing = set(Profile.objects.using(target).filter(pk__in=[p.pk for p in batch]).values_list("pk", flat=True))
+            copy_rows(Profile, [profile for profile in batch if profile.pk not in existing], target)
+
+    def delete(self, model, queryset, source, batch_size):
+        queryset = queryset.order_by("pk").values_list("pk", flat=True)
+        while True:
+            pks = list(queryset[:batch_size])
+            if not pks:
+                return
+            # plain DELETE, no collector: children are already gone (reverse FK
+            # order), and post_delete receivers would log sync tombstones and
+            # storage releases on the shard the institute just left
+            with transaction.atomic(using=source):
+                model._base_manager.using(source).filter(pk__in=pks)._raw_delete(source)
+
+    def delete_members(self, institute, source):
+        user_ids = list(Profile.objects.using(source).filter(institute=institute).values_list("user_id", flat=True))
+        with transaction.atomic(using=source):
+            Profile.objects.using(source).filter(institute=institute).delete()
+            User.objects.using(source).filter(pk__in=user_ids).delete()
+            Institute.objects.using(source).filter(pk=institute.pk).delete()
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='institute',
+            name='db_alias',
+            field=models.CharField(default='default', max_length=50),
+        ),
+    ]
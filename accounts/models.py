@@ -5,6 +5,7 @@ from django.contrib.auth.models import User
 class Institute(models.Model):
     name = models.CharField(max_length=200, unique=True)
     code = models.CharField(max_length=50, unique=True)  # example: IIITG
+    db_alias = models.CharField(max_length=50, default="default")  # shard holding marketplace/orders/issues data
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
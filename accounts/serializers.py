@@ -1,8 +1,9 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt import serializers as jwt_serializers
 
 from .models import Institute, Profile
+from .tokens import RefreshToken
 
 
 class InstituteSerializer(serializers.ModelSerializer):
@@ -84,4 +85,9 @@ class MeSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email", "date_joined", "role", "institute"]
 
 class LogoutSerializer(serializers.Serializer):
-    refresh = serializers.CharField()
\ No newline at end of file
+    refresh = serializers.CharField()
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    # blacklist check goes through the in-memory filter (accounts/blacklist.py)
+    token_class = RefreshToken
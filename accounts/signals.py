@@ -1,8 +1,11 @@
-from django.db.models.signals import post_save
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import Profile, Institute
 
+from core.sharding import mirror, shard_aliases
+
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
@@ -11,3 +14,49 @@ def create_profile(sender, instance, created, **kwargs):
     So this signal won't auto-create Profile blindly.
     """
     pass
+
+
+# =========================
+# SHARD MIRRORS
+# =========================
+# Institute / User / Profile live on "default"; a copy is kept on the shard of
+# the user's institute so tenant rows there can JOIN against them.
+
+@receiver(post_save, sender=Institute)
+def mirror_institute(sender, instance, using, **kwargs):
+    if using == DEFAULT_DB_ALIAS and instance.db_alias != DEFAULT_DB_ALIAS:
+        mirror(instance, instance.db_alias)
+
+
+@receiver(post_save, sender=User)
+def mirror_user(sender, instance, using, **kwargs):
+    if using != DEFAULT_DB_ALIAS:
+        return
+    alias = (
+        Profile.objects.filter(user_id=instance.pk)
+        .values_list("institute__db_alias", flat=True).first()
+    )
+    if alias and alias != DEFAULT_DB_ALIAS:
+        mirror(instance, alias)
+
+
+@receiver(post_save, sender=Profile)
+def mirror_profile(sender, instance, using, **kwargs):
+    if using != DEFAULT_DB_ALIAS:
+        return
+    institute = instance.institute
+    if institute.db_alias != DEFAULT_DB_ALIAS:
+        mirror(institute, institute.db_alias)
+        mirror(instance.user, institute.db_alias)
+        mirror(instance, institute.db_alias)
+
+
+@receiver(post_delete, sender=Institute)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Profile)
+def delete_mirrors(sender, instance, using, **kwargs):
+    # cascades on "default" can't reach shard rows, so delete there as well
+    if using != DEFAULT_DB_ALIAS:
+        return
+    for alias in shard_aliases():
+        sender._base_manager.using(alias).filter(pk=instance.pk).delete()
@@ -1,3 +1,136 @@
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.management.commands.move_institute import Command as MoveInstitute
+from core.sharding import use_tenant
+from issues.models import Issue
+from marketplace.models import Listing, ListingImage, UserStorageUsage
+from marketplace.quotas import charge
+from notifications.models import Notification
+from orders.models import Order
+from sync.models import ChangeEntry
+
+from .models import Institute, Profile
+
+
+def member(username, institute, role="STUDENT"):
+    user = User.objects.create_user(username)
+    Profile.objects.create(user=user, institute=institute, role=role)
+    return user
+
+
+# one sqlite file per alias: TENANT_SHARDS=shard1 python manage.py test accounts
+@unittest.skipUnless("shard1" in settings.DATABASES, "needs a shard1 alias (TENANT_SHARDS=shard1)")
+class ShardingTests(TestCase):
+    databases = "__all__"  # User / Profile deletes reach every shard
+
+    def setUp(self):
+        self.institute = Institute.objects.create(name="Sharded Institute", code="SHARD", db_alias="shard1")
+        self.seller = member("seller", self.institute)
+
+    def test_members_are_mirrored(self):
+        self.assertTrue(Institute.objects.using("shard1").filter(pk=self.institute.pk).exists())
+        self.assertTrue(User.objects.using("shard1").filter(pk=self.seller.pk).exists())
+        self.assertTrue(Profile.objects.using("shard1").filter(user=self.seller).exists())
+
+        self.seller.delete()
+        self.assertFalse(User.objects.using("shard1").filter(pk=self.seller.pk).exists())
+
+    def test_rows_are_routed_by_institute(self):
+        listing = Listing(institute=self.institute, owner=self.seller, title="Cycle", price=1500)
+        listing.save()
+
+        self.assertEqual(listing._state.db, "shard1")
+        self.assertTrue(Listing.objects.using("shard1").filter(pk=listing.pk).exists())
+        self.assertFalse(Listing.objects.using("default").exists())
+
+    def test_reads_follow_the_tenant(self):
+        with use_tenant(self.institute):
+            Listing.objects.create(institute=self.institute, owner=self.seller, title="Cycle", price=1500)
+
+        self.assertEqual(Listing.objects.count(), 0)  # no tenant: "default"
+        with use_tenant(self.institute):
+            self.assertEqual(Listing.objects.count(), 1)
+            listing = Listing.objects.select_related("owner__profile__institute").get()
+            self.assertEqual(listing.owner.profile.institute.code, "SHARD")
+
+
+@unittest.skipUnless("shard1" in settings.DATABASES, "needs a shard1 alias (TENANT_SHARDS=shard1)")
+class MoveInstituteTests(TestCase):
+    databases = "__all__"  # User / Profile deletes reach every shard
+
+    def setUp(self):
+        self.institute = Institute.objects.create(name="Moving Institute", code="MOVE")
+        self.seller = member("seller", self.institute)
+        self.buyer = member("buyer", self.institute)
+
+        listing = Listing.objects.create(institute=self.institute, owner=self.seller, title="Cycle", price=1500)
+        ListingImage.objects.create(listing=listing, image="listing_images/cycle.jpg", size=2048)
+        charge(self.institute, self.seller, 2048, using="default")
+        Order.objects.create(institute=self.institute, listing=listing, buyer=self.buyer, seller=self.seller)
+        Issue.objects.create(
+            institute=self.institute, created_by=self.buyer, title="Wifi", description="Down", category="wifi",
+        )
+        Notification.objects.create(institute=self.institute, user=self.seller, title="Hi", message="Hello")
+
+    def counts(self, alias):
+        models = (Listing, ListingImage, Order, Issue, Notification, ChangeEntry, UserStorageUsage)
+        return {model.__name__: model.objects.using(alias).count() for model in models}
+
+    def move(self, target="shard1"):
+        call_command("move_institute", "MOVE", target, batch_size=2, stdout=mock.MagicMock(), stderr=mock.MagicMock())
+
+    def test_move(self):
+        before = self.counts("default")
+        self.assertTrue(all(before.values()), before)
+
+        self.move()
+
+        self.assertEqual(self.counts("shard1"), before)
+        # no tombstones or storage releases left behind on the source
+        self.assertEqual(set(self.counts("default").values()), {0})
+
+        self.institute.refresh_from_db()
+        self.assertEqual(self.institute.db_alias, "shard1")
+        self.assertTrue(User.objects.using("shard1").filter(pk=self.buyer.pk).exists())
+        self.assertEqual(UserStorageUsage.objects.using("shard1").get(user=self.seller).bytes, 2048)
+        self.assertEqual(Order.objects.using("shard1").get().listing.title, "Cycle")
+
+    def test_move_back(self):
+        self.move()
+        self.move("default")
+
+        self.assertEqual(set(self.counts("shard1").values()), {0})
+        self.assertFalse(User.objects.using("shard1").filter(pk=self.buyer.pk).exists())
+        self.assertFalse(Institute.objects.using("shard1").exists())
+        self.assertEqual(Listing.objects.using("default").count(), 1)
+
+    def test_source_changed_during_copy(self):
+        before = self.counts("default")
+        copy = MoveInstitute.copy
+
+        def copy_then_write(command, model, queryset, target, batch_size):
+            copied = copy(command, model, queryset, target, batch_size)
+            if model is Issue:
+                Issue.objects.create(
+                    institute=self.institute, created_by=self.buyer, title="Late", description="-", category="mess",
+                )
+            return copied
+
+        with mock.patch.object(MoveInstitute, "copy", copy_then_write):
+            with self.assertRaisesMessage(CommandError, "changed on 'default' during the copy"):
+                self.move()
+
+        self.institute.refresh_from_db()
+        self.assertEqual(self.institute.db_alias, "default")
+        self.assertEqual(set(self.counts("shard1").values()), {0})
+        self.assertEqual(Issue.objects.using("default").count(), before["Issue"] + 1)
+
+    def test_unknown_target(self):
+        with self.assertRaisesMessage(CommandError, "not in DATABASES"):
+            self.move("nowhere")
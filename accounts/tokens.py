@@ -0,0 +1,20 @@
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.settings import api_settings
+
+from .blacklist import blacklist_filter
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    Refresh token whose blacklist check consults the in-memory filter
+    first, so tokens that were never blacklisted skip the database.
+    """
+
+    def check_blacklist(self):
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -1,7 +1,11 @@
 from rest_framework.generics import GenericAPIView
 from rest_framework import permissions, status, generics
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from core.throttling import IPTokenBucketThrottle
+
+from .tokens import RefreshToken
 
 from .serializers import RegisterSerializer, MeSerializer, LogoutSerializer, InstituteSerializer
 
@@ -12,9 +16,17 @@ class InstituteListAPIView(generics.ListAPIView):
     serializer_class = InstituteSerializer
     permission_classes = [permissions.AllowAny]
 
+class LoginAPIView(TokenObtainPairView):
+    # 🚦 password hashing is expensive: per-IP token bucket
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = "login"
+
+
 class RegisterAPIView(GenericAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = RegisterSerializer
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = "register"
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -0,0 +1,60 @@
+"""
+Building blocks for admin change lists over large tables.
+"""
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+ESTIMATE_SQL = {
+    "mysql": (
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    ),
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+}
+
+
+def estimated_count(queryset):
+    """
+    The database's own row estimate for an unfiltered queryset, from table
+    statistics instead of a COUNT(*) scan. None when the queryset is
+    filtered or the backend keeps no estimate (sqlite).
+    """
+    if queryset.query.where:
+        return None
+
+    connection = connections[queryset.db]
+    sql = ESTIMATE_SQL.get(connection.vendor)
+    if sql is None:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:  # postgres: -1 = never analyzed
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Unfiltered change lists of big tables use the estimate. Small tables
+    (below `threshold`) and filtered or searched lists still count exactly.
+    """
+
+    threshold = 100_000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < self.threshold:
+            return super().count
+        return estimate
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # skips the second, unfiltered COUNT(*)
+    list_per_page = 50
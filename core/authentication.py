@@ -0,0 +1,35 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication as BaseJWTAuthentication
+
+from accounts.models import Profile
+
+from .profiling import phase
+from .sharding import activate
+
+
+class JWTAuthentication(BaseJWTAuthentication):
+    """
+    simplejwt authentication that reports its time to the request profiler
+    and loads profile + institute in one query, since every tenant-scoped
+    view reads `request.user.profile.institute` right after auth.
+    """
+
+    def authenticate(self, request):
+        # sub-requests of /api/batch/ reuse the batch request's result
+        shared = getattr(request._request, "batch_auth", None)
+        if shared is not None:
+            return shared
+
+        with phase("auth"):
+            result = super().authenticate(request)
+
+        if result is not None:
+            with phase("profile"):
+                self.load_profile(result[0])
+
+        return result
+
+    def load_profile(self, user):
+        profile = Profile.objects.select_related("institute").filter(user=user).first()
+        if profile is not None:
+            user.profile = profile
+            activate(profile.institute)
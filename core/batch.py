@@ -0,0 +1,149 @@
+"""
+POST /api/batch/ - several GET requests in one round trip.
+
+    {"requests": [{"id": "me", "path": "/api/auth/me/"},
+                  {"id": "unread", "path": "/api/notifications/unread_count/"}],
+     "concurrent": false}
+
+Each sub-request is resolved and dispatched straight to its view, with the
+batch request's user, profile and tenant: the JWT is decoded once, the
+profile is loaded once, and the middleware stack runs once. The answer
+lists one {"id", "status", "body"} per sub-request, in request order; a
+failing item does not fail the batch.
+
+Bodies are rendered by the sub-request's own view and spliced into the
+combined response as bytes, so they are not parsed and re-encoded.
+
+"concurrent": true runs the items on a small thread pool (BATCH_API
+MAX_WORKERS). Each worker uses its own database connection, so it only
+pays off when the items are slow queries, not on the usual bootstrap set.
+"""
+import contextvars
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import Http404, HttpRequest, HttpResponse, QueryDict
+from django.urls import Resolver404, resolve
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from .renderers import orjson
+
+
+logger = logging.getLogger(__name__)
+
+_DEFAULTS = {
+    "MAX_REQUESTS": 20,
+    "MAX_WORKERS": 4,
+}
+
+# the outer request's META minus anything describing its own body / route
+_DROPPED_META = {"CONTENT_LENGTH", "CONTENT_TYPE", "PATH_INFO", "QUERY_STRING", "REQUEST_METHOD"}
+
+
+def _config(name):
+    return getattr(settings, "BATCH_API", {}).get(name, _DEFAULTS[name])
+
+
+def _dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode()
+
+
+def _error(status, detail):
+    return status, _dumps({"detail": detail})
+
+
+def _sub_request(request, path, query):
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key not in _DROPPED_META}
+    sub.META.update(REQUEST_METHOD="GET", PATH_INFO=path, QUERY_STRING=query, HTTP_ACCEPT="application/json")
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    sub.user = request.user
+    # core.authentication.JWTAuthentication returns this instead of decoding again
+    sub.batch_auth = (request.user, request.auth)
+    return sub
+
+
+def run_one(request, path):
+    """(status, body bytes) of GET `path` on behalf of `request`."""
+    path, _, query = path.partition("?")
+    if not path.startswith("/api/") or path.rstrip("/") == request.path.rstrip("/"):
+        return _error(400, "Only GET /api/ paths can be batched.")
+
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return _error(404, "Not found.")
+
+    try:
+        response = match.func(_sub_request(request, path, query), *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+    except Http404:
+        return _error(404, "Not found.")
+    except PermissionDenied:
+        return _error(403, "You do not have permission to perform this action.")
+    except Exception:
+        logger.exception("Batched request to %s failed", path)
+        return _error(500, "Server error.")
+
+    if response.streaming:
+        return _error(400, "Streaming responses cannot be batched.")
+    if not response.get("Content-Type", "").startswith("application/json"):
+        return response.status_code, _dumps(response.content.decode(response.charset or "utf-8"))
+    return response.status_code, response.content or b"null"
+
+
+def _in_worker(context, request, path):
+    try:
+        return context.run(run_one, request, path)
+    finally:
+        connections.close_all()  # this thread's own connections
+
+
+class BatchView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(request=OpenApiTypes.OBJECT, responses={200: OpenApiTypes.OBJECT})
+    def post(self, request):
+        items = request.data.get("requests")
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"requests": "A non-empty list of {id, path} objects is required."})
+        if len(items) > _config("MAX_REQUESTS"):
+            raise ValidationError({"requests": f"At most {_config('MAX_REQUESTS')} requests per batch."})
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+                raise ValidationError({"requests": "Every request needs a string `path`."})
+            if item.get("method", "GET").upper() != "GET":
+                raise ValidationError({"requests": "Only GET requests can be batched."})
+
+        # the plain Django request: views wrap it in their own DRF Request
+        outer = request._request
+        outer.user, outer.auth = request.user, request.auth
+        paths = [item["path"] for item in items]
+
+        if request.data.get("concurrent") and len(items) > 1:
+            # contexts are copied here, so every worker sees this request's tenant
+            contexts = [contextvars.copy_context() for _ in paths]
+            with ThreadPoolExecutor(max_workers=min(_config("MAX_WORKERS"), len(items))) as pool:
+                results = list(pool.map(_in_worker, contexts, [outer] * len(paths), paths))
+        else:
+            results = [run_one(outer, path) for path in paths]
+
+        parts = [
+            b'{"id":%s,"status":%d,"body":%s}' % (_dumps(item.get("id", index)), status, body)
+            for index, (item, (status, body)) in enumerate(zip(items, results))
+        ]
+        return HttpResponse(b'{"responses":[' + b",".join(parts) + b"]}", content_type="application/json")
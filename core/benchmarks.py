@@ -0,0 +1,81 @@
+"""
+Shared helpers for the bench_* management commands.
+
+Benchmarks seed their data inside `rolled_back()`, so they can be pointed
+at any database without leaving rows behind.
+"""
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def best_of(fn, repeat):
+    """Fastest of `repeat` runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def seed_campus(rows, images=3, code="BENCH"):
+    """
+    One institute with a seller and a buyer, `rows` listings (with
+    `images` image rows each), one order per listing and `rows` issues.
+    Returns the institute.
+    """
+    from accounts.models import Institute, Profile
+    from issues.models import Issue
+    from marketplace.models import Category, Listing, ListingImage
+    from orders.models import Order
+
+    institute = Institute.objects.create(name=f"Bench Institute {code}", code=code)
+    User.objects.bulk_create([
+        User(username=f"{code.lower()}-{name}", email=f"{name}@{code.lower()}.example.com")
+        for name in ("buyer", "seller")
+    ])
+    buyer, seller = User.objects.filter(username__startswith=f"{code.lower()}-").order_by("username")
+    Profile.objects.bulk_create([
+        Profile(user=buyer, institute=institute, role="STUDENT"),
+        Profile(user=seller, institute=institute, role="STUDENT"),
+    ])
+    category = Category.objects.create(institute=institute, name="Bench")
+
+    Listing.objects.bulk_create([
+        Listing(
+            institute=institute, owner=seller, category=category if i % 2 else None,
+            title=f"Item {i}", description="Lightly used, pick up from hostel", price=100 + i,
+        )
+        for i in range(rows)
+    ])
+    listings = list(Listing.objects.filter(institute=institute))
+    ListingImage.objects.bulk_create([
+        ListingImage(listing=listing, image=f"listings/{code.lower()}-{listing.id}-{n}.jpg")
+        for listing in listings for n in range(images)
+    ])
+    Order.objects.bulk_create([
+        Order(institute=institute, listing=listing, buyer=buyer, seller=seller)
+        for listing in listings
+    ])
+    Issue.objects.bulk_create([
+        Issue(institute=institute, created_by=buyer, title=f"Issue {i}", description="Wi-Fi down", category="wifi")
+        for i in range(rows)
+    ])
+    return institute
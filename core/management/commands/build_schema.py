@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.schema import build_schema, code_version, prune_schemas, schema_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema served at /api/schema/ and store it under "
+        "the current code version (run it as a deploy step), then delete older "
+        "files except the previous release's. With --check, only fail when the "
+        "stored schema is missing or stale."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="exit non-zero if the stored schema is stale")
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            if not schema_path().exists():
+                raise CommandError(f"OpenAPI schema is stale: {schema_path()} does not exist; run build_schema")
+            self.stdout.write(f"OpenAPI schema is up to date ({code_version()})")
+            return
+
+        path = build_schema()
+        removed = prune_schemas(path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {path} ({path.stat().st_size / 1024:.0f} KiB), removed {removed} older schema files"
+        ))
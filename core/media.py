@@ -0,0 +1,151 @@
+"""
+Serving uploaded media.
+
+settings.MEDIA_SERVING["MODE"] picks who moves the bytes:
+
+  django      django.views.static.serve, as in development
+  stream      FileResponse from Django (wsgi.file_wrapper / sendfile when
+              the server has it), with single byte-range support
+  x-accel     empty response + X-Accel-Redirect; nginx serves the file
+              from an `internal` location mapped onto MEDIA_ROOT
+  x-sendfile  empty response + X-Sendfile (Apache mod_xsendfile, lighttpd)
+
+Every mode except "django" sends Cache-Control, ETag, Last-Modified and
+Accept-Ranges, and answers If-None-Match / If-Modified-Since with 304.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views import static
+from django.views.decorators.http import require_safe
+
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _config():
+    return getattr(settings, "MEDIA_SERVING", {})
+
+
+def _etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to send the
+    whole file (no/multi/malformed range), or "unsatisfiable".
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith("W/"):
+        return value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and int(mtime) <= date
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    config = _config()
+    mode = config.get("MODE", "stream")
+    if mode == "django":
+        return static.serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    etag = _etag(stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": f"public, max-age={config.get('MAX_AGE', 86400)}",
+        "Accept-Ranges": "bytes",
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for name, value in headers.items():
+            not_modified.headers.setdefault(name, value)
+        return not_modified
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+    if mode == "x-accel":
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["X-Accel-Redirect"] = config.get("X_ACCEL_PREFIX", "/protected-media/") + quote(path)
+        return response
+
+    if mode == "x-sendfile":
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["X-Sendfile"] = full_path
+        return response
+
+    byte_range = None
+    if _if_range_matches(request, etag, stat.st_mtime):
+        byte_range = parse_range(request.headers.get("Range"), stat.st_size)
+
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416, headers=headers)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+
+    if byte_range is not None:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(full_path, start, end - start + 1),
+            status=206, content_type=content_type, headers=headers,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(end - start + 1)
+        return response
+
+    response = FileResponse(open(full_path, "rb"), content_type=content_type, headers=headers)
+    response.block_size = CHUNK_SIZE
+    return response
@@ -0,0 +1,327 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters and histograms keep one value dict per thread, so the hot path
+(`inc` / `observe`) never takes a lock: only the thread that owns a shard
+writes to it, and collection sums copies of every shard.
+
+Each worker process can also dump its totals to
+settings.METRICS["MULTIPROCESS_DIR"]; the /metrics/ endpoint then merges
+the files of every worker with the live values of the serving process.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from .profiling import capture_queries
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _config():
+    return getattr(settings, "METRICS", {})
+
+
+class _ShardHolder:
+    """Per-thread owner of a shard (a plain dict can't be weak-referenced)."""
+
+    def __init__(self):
+        self.values = {}
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}  # totals of threads that have exited
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.holder.values
+        except AttributeError:
+            holder = _ShardHolder()
+            with self._lock:
+                self._shards.append(holder.values)
+            # the holder dies with its thread's locals: fold the shard into
+            # _retired then, so short-lived threads don't pile up shards
+            weakref.finalize(holder, self._retire, holder.values)
+            self._local.holder = holder
+            return holder.values
+
+    def _retire(self, values):
+        with self._lock:
+            self._shards = [shard for shard in self._shards if shard is not values]
+            for key, value in values.items():
+                self._retired[key] = self._merge(self._retired.get(key), value)
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(value) for value in labels)
+
+    def snapshot(self):
+        """Return {label tuple: value} summed over every thread shard."""
+        with self._lock:
+            shards = [self._retired.copy()] + [shard.copy() for shard in self._shards]
+
+        total = {}
+        for shard in shards:
+            for key, value in shard.items():
+                total[key] = self._merge(total.get(key), value)
+        return total
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        values = self._shard()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+
+    def _merge(self, current, value):
+        return value if current is None else current + value
+
+
+class Histogram(Metric):
+    """Values are lists of per-bucket counts (non-cumulative) + [sum, count]."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        values = self._shard()
+        key = self._key(labels)
+        row = values.get(key)
+        if row is None:
+            row = values[key] = [0] * (len(self.buckets) + 3)
+
+        row[bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def _merge(self, current, value):
+        if current is None:
+            return list(value)
+        return [a + b for a, b in zip(current, value)]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def collect(self, extra_snapshots=()):
+        """Merge the live snapshot with snapshots dumped by other processes."""
+        merged = self.snapshot()
+        for snapshot in extra_snapshots:
+            for name, values in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged.setdefault(name, {})
+                for key, value in values.items():
+                    target[key] = metric._merge(target.get(key), value)
+        return merged
+
+    def render(self, extra_snapshots=()):
+        lines = []
+        for name, values in sorted(self.collect(extra_snapshots).items()):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(values.items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind == "counter":
+                    lines.append(f"{name}{_labels(labels)} {value}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), value):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {value[-2]}")
+                lines.append(f"{name}_count{_labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+
+
+# =========================
+# MULTI-PROCESS DUMPS
+# =========================
+_process_files = {}
+_last_dump = 0.0
+
+
+def _process_file():
+    # Resolved per pid, so workers forked after import get their own file.
+    pid = os.getpid()
+    if pid not in _process_files:
+        _process_files[pid] = f"metrics-{pid}-{int(time.time())}.json"
+    return _process_files[pid]
+
+
+def _encode(snapshot):
+    return {name: [[list(key), value] for key, value in values.items()] for name, values in snapshot.items()}
+
+
+def _decode(data):
+    return {name: {tuple(key): value for key, value in rows} for name, rows in data.items()}
+
+
+def dump_process_metrics(force=False):
+    """Write this process's totals to the shared directory (rate limited)."""
+    global _last_dump
+    directory = _config().get("MULTIPROCESS_DIR")
+    now = time.monotonic()
+    if not directory or (not force and now - _last_dump < _config().get("FLUSH_INTERVAL", 5)):
+        return
+    _last_dump = now
+
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(_encode(REGISTRY.snapshot()), fh)
+    os.replace(tmp_path, os.path.join(directory, _process_file()))
+
+
+def other_process_snapshots():
+    directory = _config().get("MULTIPROCESS_DIR")
+    if not directory or not os.path.isdir(directory):
+        return []
+
+    snapshots = []
+    for filename in os.listdir(directory):
+        if filename == _process_file() or not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as fh:
+                snapshots.append(_decode(json.load(fh)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+# =========================
+# REQUEST METRICS
+# =========================
+REQUESTS = counter("http_requests_total", "Requests served.", ["view", "method", "status"])
+ERRORS = counter("http_request_errors_total", "Requests that ended in a 5xx or an exception.", ["view"])
+LATENCY = histogram("http_request_duration_seconds", "Request latency.", ["view"])
+QUERIES = histogram(
+    "http_request_db_queries", "Database queries per request.", ["view"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+
+
+def view_label(request, view_func):
+    """
+    "<basename>.<action>" for DRF viewsets (e.g. orders.accept),
+    the URL name for everything else.
+    """
+    initkwargs = getattr(view_func, "initkwargs", None) or {}
+    actions = getattr(view_func, "actions", None)
+    if actions and initkwargs.get("basename"):
+        return f"{initkwargs['basename']}.{actions.get(request.method.lower(), request.method.lower())}"
+
+    match = request.resolver_match
+    return match.view_name if match is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not _config().get("ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._metrics_view = "unmatched"
+        start = time.perf_counter()
+        try:
+            with capture_queries() as queries:
+                response = self.get_response(request)
+        except Exception:
+            ERRORS.inc(request._metrics_view)
+            raise
+
+        label = request._metrics_view
+        REQUESTS.inc(label, request.method, response.status_code)
+        LATENCY.observe(time.perf_counter() - start, label)
+        QUERIES.observe(queries.count, label)
+        if response.status_code >= 500:
+            ERRORS.inc(label)
+
+        dump_process_metrics()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_label(request, view_func)
+
+
+def metrics_view(request):
+    # Behind a reverse proxy every request comes from 127.0.0.1, so the IP
+    # check alone is no gate: a token is required unless explicitly waived.
+    config = _config()
+    token = config.get("TOKEN")
+    if token:
+        if not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            raise Http404
+    elif not config.get("ALLOW_WITHOUT_TOKEN", False):
+        raise Http404
+    if request.META.get("REMOTE_ADDR") not in config.get("ALLOWED_IPS", ["127.0.0.1", "::1"]):
+        raise Http404
+
+    return HttpResponse(
+        REGISTRY.render(other_process_snapshots()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,3 +1,6 @@
+from rest_framework import serializers
+
+
 class InstituteQuerySetMixin:
     """
     Ensures data isolation per institute (multi-tenant).
@@ -5,3 +8,113 @@ class InstituteQuerySetMixin:
     """
     def get_institute(self):
         return self.request.user.profile.institute
+
+
+# =========================
+# SPARSE FIELDSETS (?fields= / ?expand=)
+# =========================
+# Without either parameter every serializer renders in full, as before.
+# With one of them, a response keeps only the fields named in `fields`
+# (all of them when it is absent), and nested relations listed in a
+# serializer's `expandable_fields` appear only when named in `fields` or
+# `expand`. Dotted names reach into nested serializers:
+#
+#   /api/orders/?fields=id,status,listing.title
+#   /api/orders/?expand=listing,listing.images
+
+
+def _names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def sparse_params(request):
+    """(fields or None, expand) from the query string, or None if neither is given."""
+    params = getattr(request, "query_params", None)
+    if params is None or ("fields" not in params and "expand" not in params):
+        return None
+    if request.method not in ("GET", "HEAD"):
+        return None  # writes validate every field; only reads are trimmed
+    fields = _names(params["fields"]) if "fields" in params else None
+    return fields, _names(params.get("expand", ""))
+
+
+def _below(names, field):
+    prefix = field + "."
+    return {name[len(prefix):] for name in names if name.startswith(prefix)}
+
+
+class SparseFieldsSerializerMixin:
+    expandable_fields = ()
+
+    def _sparse_spec(self):
+        if hasattr(self, "_sparse"):
+            return self._sparse  # handed down by a sparse parent
+
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None
+        return sparse_params(self.context.get("request"))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self._sparse_spec()
+        if spec is None:
+            return fields
+
+        only, expand = spec
+        top = None if only is None else {name.split(".", 1)[0] for name in only}
+        named = (top or set()) | {name.split(".", 1)[0] for name in expand}
+
+        for name in list(fields):
+            if fields[name].write_only:
+                continue  # sparse fieldsets only shape the output
+            if (top is not None and name not in top) or (name in self.expandable_fields and name not in named):
+                del fields[name]
+                continue
+
+            child = getattr(fields[name], "child", fields[name])
+            if isinstance(child, SparseFieldsSerializerMixin):
+                nested = None if only is None or name in only else _below(only, name)
+                child._sparse = (nested, _below(expand, name))
+        return fields
+
+
+def rendered_fields(serializer, prefix=""):
+    """Dotted names of every field `serializer` outputs, nested ones included."""
+    names = set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        names.add(prefix + name)
+        child = getattr(field, "child", field)
+        if isinstance(child, serializers.BaseSerializer):
+            names |= rendered_fields(child, f"{prefix}{name}.")
+    return names
+
+
+class SparseFieldsViewMixin:
+    """
+    Loads only the relations a sparse response renders. Maps serializer
+    field names to the select_related / prefetch_related paths they need.
+    Views with a .values() fast path fall back to the serializer for
+    sparse requests (see `sparse_params`).
+    """
+
+    sparse_select_related = {}
+    sparse_prefetch_related = {}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if sparse_params(self.request) is None:
+            return queryset
+
+        rendered = rendered_fields(self.get_serializer())
+        select = {path for name, paths in self.sparse_select_related.items() if name in rendered for path in paths}
+        prefetch = {path for name, paths in self.sparse_prefetch_related.items() if name in rendered for path in paths}
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:  # select_related() with no arguments would follow every FK
+            queryset = queryset.select_related(*sorted(select))
+        return queryset.prefetch_related(*sorted(prefetch))
@@ -0,0 +1,21 @@
+from rest_framework import pagination
+
+from .profiling import begin_phase, end_phase
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """
+    Default paginator. The page is fetched (SQL + prefetches) inside
+    paginate_queryset and the serialized data arrives in
+    get_paginated_response, so the gap between them is the list
+    serialization time reported to the profiler.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view)
+        begin_phase("serialize")
+        return page
+
+    def get_paginated_response(self, data):
+        end_phase("serialize")
+        return super().get_paginated_response(data)
@@ -0,0 +1,38 @@
+import io
+import re
+
+from django.conf import settings
+from rest_framework import parsers
+
+from .renderers import JSONRenderer, orjson
+
+
+# orjson reads integers outside int64/uint64 as floats instead of failing;
+# any run of 19+ digits may be one, so such bodies go to the stdlib parser
+LONG_NUMBER_RE = re.compile(rb"\d{19,}")
+
+class JSONParser(parsers.JSONParser):
+    """
+    Parses request bodies with orjson when available, falling back to the
+    stdlib parser for non-UTF-8 bodies, bodies with integers that may not
+    fit in 64 bits (orjson would return a float), and anything orjson
+    rejects that json would accept.
+    """
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        if orjson is None or not self.strict or encoding.lower().replace("_", "-") != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_NUMBER_RE.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+
+        return super().parse(io.BytesIO(body), media_type, parser_context)
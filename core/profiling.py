@@ -0,0 +1,176 @@
+"""
+Per-request profiling.
+
+ProfilingMiddleware splits each request into phases (auth, profile lookup,
+SQL, serialization, view, render) and reports them through a
+`Server-Timing` header and an optional sampled structured log line.
+
+Code deeper in the stack records phases with `phase("name")` (or the
+begin/end pair when a span crosses two hooks). Both are no-ops when no
+profile is active, so leaving them in place costs next to nothing when
+profiling is disabled.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger("core.profiling")
+
+_active = ContextVar("request_profile", default=None)
+
+
+class QueryTimer:
+    """
+    Database execute wrapper that counts queries and their total time.
+    Install with `connection.execute_wrapper(timer)`.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+@contextmanager
+def capture_queries():
+    """Time every query on every configured connection while the block runs."""
+    timer = QueryTimer()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        yield timer
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self._open = {}
+
+    def add(self, name, duration):
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def begin(self, name):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name):
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.add(name, time.perf_counter() - started)
+
+
+def current_profile():
+    return _active.get()
+
+
+@contextmanager
+def phase(name):
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - start)
+
+
+def begin_phase(name):
+    profile = _active.get()
+    if profile is not None:
+        profile.begin(name)
+
+
+def end_phase(name):
+    profile = _active.get()
+    if profile is not None:
+        profile.end(name)
+
+
+def _server_timing(phases, queries):
+    entries = []
+    for name, duration in phases.items():
+        entry = f"{name};dur={duration * 1000:.2f}"
+        if name == "db":
+            entry += f';desc="{queries} queries"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+class ProfilingMiddleware:
+    """
+    Must sit first in MIDDLEWARE so "total" covers the whole stack.
+    Configured through settings.PROFILING:
+
+        ENABLED        turn the middleware on at all (off = removed from the chain)
+        SERVER_TIMING  emit the Server-Timing header on every response
+        SAMPLE_RATE    fraction of requests (0.0 - 1.0) logged to "core.profiling"
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "PROFILING", {})
+        if not config.get("ENABLED", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.server_timing = config.get("SERVER_TIMING", True)
+        self.sample_rate = config.get("SAMPLE_RATE", 0.0)
+
+    def __call__(self, request):
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (self.server_timing or sampled):
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _active.set(profile)
+        try:
+            with capture_queries() as queries:
+                response = self.get_response(request)
+        finally:
+            _active.reset(token)
+
+        profile.end("view")
+        profile.add("total", time.perf_counter() - profile.started)
+        profile.add("db", queries.duration)
+
+        if self.server_timing:
+            response["Server-Timing"] = _server_timing(profile.phases, queries.count)
+
+        if sampled:
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": queries.count,
+                "phases_ms": {name: round(d * 1000, 2) for name, d in profile.phases.items()},
+            }))
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        begin_phase("view")
+
+    def process_template_response(self, request, response):
+        profile = _active.get()
+        if profile is not None:
+            profile.end("view")
+            profile.begin("render")
+            response.add_post_render_callback(lambda r: profile.end("render"))
+        return response
@@ -0,0 +1,66 @@
+"""
+JSON renderer backed by orjson when it is installed.
+
+orjson is an optional dependency: without it (or whenever a payload needs
+something orjson cannot do, e.g. indentation, ASCII-only output,
+integers wider than 64 bits or NaN / Infinity, which orjson writes as
+null) rendering falls back to DRF's stdlib-json JSONRenderer, so the
+output is the same either way.
+"""
+import math
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+# datetimes/dates/times go through DRF's encoder so "+00:00" still becomes "Z";
+# Decimal, lazy strings, querysets etc. reach it through `default` anyway.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+_drf_default = encoders.JSONEncoder().default
+
+
+def _has_non_finite(data):
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # NaN / Infinity come out as null; let the stdlib renderer deal with
+        # them (it raises in strict mode). Only payloads with a null can have one.
+        if b"null" in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # same strict-javascript-subset escaping as the stdlib renderer
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
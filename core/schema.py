@@ -0,0 +1,186 @@
+"""
+The OpenAPI schema, generated once per code version instead of per request.
+
+drf-spectacular walks every viewset and serializer to build the schema;
+SpectacularAPIView does that on each GET of /api/schema/. Here the schema
+is built by `manage.py build_schema` (deploy step) or on first use, stored
+as OPENAPI_SCHEMA_DIR/openapi-<code version>.json, and served from memory
+with an ETag, so docs pages and client generators mostly get a 304.
+
+The code version is a hash of the project's Python sources, the API
+library versions and SPECTACULAR_SETTINGS: any change to them means a new
+file. `manage.py check --deploy` and `build_schema --check` fail while the
+stored file is missing or from other code. Old files are only removed by
+`build_schema`, and it keeps the newest one before its own: workers of the
+previous release, still starting during a rolling deploy, find theirs.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+
+_lock = threading.Lock()
+_rendered = {}  # (code version, renderer format) -> bytes
+
+
+def schema_dir():
+    return Path(getattr(settings, "OPENAPI_SCHEMA_DIR", Path(settings.BASE_DIR) / "schema"))
+
+
+def _source_files():
+    base = os.path.realpath(settings.BASE_DIR)
+    for app in apps.get_app_configs():
+        path = os.path.realpath(app.path)
+        # third-party apps count through their version; skip a venv kept in the project
+        if not path.startswith(base + os.sep) or "site-packages" in path:
+            continue
+        for directory, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in ("migrations", "__pycache__"))
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    yield os.path.join(directory, name)
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """Short hash of everything the generated schema depends on."""
+    import django
+    import drf_spectacular
+    import rest_framework
+
+    digest = hashlib.sha256()
+    versions = [sys.version_info[:2], django.__version__, rest_framework.__version__, drf_spectacular.__version__]
+    digest.update(repr(versions).encode())
+    digest.update(repr(sorted(getattr(settings, "SPECTACULAR_SETTINGS", {}).items())).encode())
+    base = os.path.realpath(settings.BASE_DIR)
+    for path in _source_files():
+        digest.update(os.path.relpath(path, base).encode())
+        with open(path, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:16]
+
+
+def schema_path(version=None):
+    return schema_dir() / f"openapi-{version or code_version()}.json"
+
+
+def build_schema():
+    """Generate the schema and store it under the current code version; returns the path."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    content = OpenApiJsonRenderer().render(generator.get_schema(request=None, public=True))
+
+    path = schema_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)  # readers never see half a file
+    return path
+
+
+def prune_schemas(current):
+    """
+    Delete stored schemas older than the one before `current` (the previous
+    release's); returns how many.
+    """
+    newest = current.stat().st_mtime
+    older = []
+    for path in current.parent.glob("openapi-*.json"):
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if path != current and mtime < newest:
+            older.append((mtime, path))
+
+    removed = 0
+    for _, old in sorted(older, reverse=True)[1:]:
+        try:
+            old.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass  # another deploy step got there first
+    return removed
+
+
+def load_schema():
+    """The stored schema for this code version, building it on first use."""
+    path = schema_path()
+    if not path.exists():
+        try:
+            build_schema()
+        except OSError:
+            # read-only deploy without a build step: keep it in memory only
+            generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+            return generator.get_schema(request=None, public=True)
+    return json.loads(path.read_bytes())
+
+
+def rendered_schema(renderer):
+    key = (code_version(), renderer.format)
+    content = _rendered.get(key)
+    if content is None:
+        with _lock:  # a burst of first requests builds it once
+            content = _rendered.get(key)
+            if content is None:
+                content = _rendered[key] = renderer.render(load_schema())
+    return content
+
+
+class JWTScheme(SimpleJWTScheme):
+    """The stock simplejwt extension only matches simplejwt's own class, not our subclass."""
+    target_class = "core.authentication.JWTAuthentication"
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """SpectacularAPIView serving the stored schema; ETag = code version + format."""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        # per-language and per-version schemas stay generated per request
+        if request.GET.get("lang") or request.GET.get("version") or self.custom_settings:
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        etag = f'"{code_version()}-{renderer.format}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",  # always revalidate: a deploy changes it
+            "Content-Disposition": f'inline; filename="{self._get_filename(request, None)}"',
+        }
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type += f"; charset={renderer.charset}"
+            response = HttpResponse(rendered_schema(renderer), content_type=content_type)
+        for name, value in headers.items():
+            response.headers.setdefault(name, value)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+
+@checks.register("openapi", deploy=True)
+def check_schema(app_configs, **kwargs):
+    if schema_path().exists():
+        return []
+    return [checks.Error(
+        f"The stored OpenAPI schema is missing or stale (expected {schema_path()}).",
+        hint="Run `python manage.py build_schema` as part of the deploy.",
+        id="core.E001",
+    )]
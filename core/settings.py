@@ -51,9 +51,15 @@ INSTALLED_APPS = [
     "orders",
     "issues",
     "notifications",
+    "sync",
+    "tasks",
+    "core",
 ]
 
 MIDDLEWARE = [
+    "core.profiling.ProfilingMiddleware",
+    "core.metrics.MetricsMiddleware",
+    "core.sharding.TenantMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -136,12 +142,22 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # orjson-backed JSON when installed, stdlib json otherwise (core/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -149,12 +165,171 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # token buckets for core.throttling: "<throttle_scope>.<ip|user|institute>".
+    # Buckets are per process unless CACHES is shared. Behind a reverse
+    # proxy, set "NUM_PROXIES" so client IPs come from X-Forwarded-For.
+    "DEFAULT_THROTTLE_RATES": {
+        "login.ip": "10/min",
+        "register.ip": "5/min",
+        "orders.user": "30/min",
+        "orders.institute": "600/min",
+        "upload.user": "20/min",
+        "upload.institute": "300/min",
+    },
+}
+
+SIMPLE_JWT = {
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
+}
+
+# In-memory Bloom filter in front of the refresh-token blacklist
+# (accounts/blacklist.py). It needs a shared CACHES backend (Redis,
+# Memcached, database) to tell other workers about logouts; with the
+# default per-process cache every refresh uses the exact database check.
+TOKEN_BLACKLIST_FILTER = {
+    "ENABLED": True,
+    "MAX_STALENESS": 30,
+    "REBUILD_INTERVAL": 3600,
+    "FALSE_POSITIVE_RATE": 0.01,
+}
+
+# Request profiling: Server-Timing header + sampled structured log
+# (see core/profiling.py). Disabled = middleware removed from the chain.
+PROFILING = {
+    "ENABLED": DEBUG,
+    "SERVER_TIMING": True,
+    "SAMPLE_RATE": 0.0,
+}
+
+# Marketplace facets: upper bounds of the price buckets (last bucket is open-ended)
+# and how long facet counts are cached per institute + filter set (0 = no cache).
+LISTING_PRICE_BUCKETS = [500, 1000, 2500, 5000, 10000]
+LISTING_FACETS_CACHE_TIMEOUT = 30
+
+# Cache of the default listing feed (first PAGES pages per institute),
+# invalidated by signals on Listing / ListingImage / Category changes.
+# Only used with a shared CACHES backend (see marketplace/feed_cache.py).
+LISTING_FEED_CACHE = {
+    "ENABLED": True,
+    "TIMEOUT": 60,
+    "PAGES": 3,
+    "LOCK_TIMEOUT": 5,
+    "LOCK_WAIT": 0.5,
+}
+
+# Listing view counts / "trending" score (marketplace/popularity.py).
+# Views are buffered per process and flushed in batched UPDATEs.
+LISTING_POPULARITY = {
+    "HALF_LIFE_HOURS": 72,
+    "FLUSH_INTERVAL": 10,
+    "MAX_PENDING": 1000,
+}
+
+# SOLD listings older than this are moved to the archive tables by
+# `manage.py archive_listings` (run it from cron).
+LISTING_ARCHIVE_AFTER_DAYS = 90
+
+# Rows per keyset query when streaming /export/ responses (core/exports.py).
+EXPORT_CHUNK_SIZE = 2000
+
+# Saved searches (marketplace/matching.py). New listings are matched in the
+# background task queue; MAX_STALENESS (seconds) bounds how long a worker
+# can match against an outdated index when CACHES is not shared.
+SAVED_SEARCHES = {
+    "MAX_PER_USER": 20,
+    "MAX_STALENESS": 30,
+}
+
+# POST /api/batch/ (core/batch.py): max GETs per batch, and threads used
+# when a batch asks for "concurrent": true.
+BATCH_API = {
+    "MAX_REQUESTS": 20,
+    "MAX_WORKERS": 4,
+}
+
+# Delta sync (sync/changes.py): cursors only move past change log entries
+# older than SETTLE_SECONDS, entries are kept RETENTION_DAYS
+# (`manage.py compact_changes`), and one call returns at most MAX_CHANGES.
+SYNC = {
+    "SETTLE_SECONDS": 10,
+    "RETENTION_DAYS": 30,
+    "MAX_CHANGES": 500,
+}
+
+# Notifications of one kind about one subject (e.g. order requests for a
+# listing) sent within WINDOW seconds are merged into a single row with a
+# count (notifications/utils.py). KINDS overrides the window per kind.
+NOTIFICATION_COALESCING = {
+    "WINDOW": 15 * 60,
+    "KINDS": {
+        "order_request": 60 * 60,
+    },
+}
+
+# Background tasks (tasks/queue.py), run by `manage.py run_worker`. Failed
+# tasks are retried after BACKOFF_SECONDS * 2**(attempt - 1), capped at
+# MAX_BACKOFF_SECONDS; a task whose worker stops renewing it is handed out
+# again after LEASE_SECONDS. IMMEDIATE=True runs tasks inline (no worker).
+TASKS = {
+    "IMMEDIATE": False,
+    "CONCURRENCY": 4,
+    "POLL_INTERVAL": 1.0,
+    "LEASE_SECONDS": 600,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_SECONDS": 10,
+    "MAX_BACKOFF_SECONDS": 3600,
+}
+
+# Listing image uploads (marketplace/quotas.py), in bytes; None = no limit.
+# Checked while the upload is read and again when it is saved.
+UPLOAD_LIMITS = {
+    "MAX_FILE_SIZE": 5 * 1024 * 1024,
+    "USER_QUOTA": 100 * 1024 * 1024,
+    "INSTITUTE_QUOTA": 10 * 1024 * 1024 * 1024,
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.profiling": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
 }
 
 import os
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# How /media/ files are delivered (core/media.py):
+#   "django"      django.views.static.serve (development only)
+#   "stream"      FileResponse with Range support, ETag and Cache-Control
+#   "x-accel"     nginx serves it; needs an `internal` location at
+#                 X_ACCEL_PREFIX with `alias <MEDIA_ROOT>/;`
+#   "x-sendfile"  Apache mod_xsendfile / lighttpd
+MEDIA_SERVING = {
+    "MODE": os.environ.get("MEDIA_SERVING_MODE", "stream"),
+    "X_ACCEL_PREFIX": "/protected-media/",
+    "MAX_AGE": 7 * 24 * 3600,
+}
+
+# Runtime metrics served in Prometheus text format at /metrics/ (core/metrics.py).
+# With several worker processes, point MULTIPROCESS_DIR at a directory they
+# all share; each process dumps its totals there every FLUSH_INTERVAL seconds.
+# Scrapers send "Authorization: Bearer <TOKEN>"; without a TOKEN the view is
+# off unless ALLOW_WITHOUT_TOKEN is set (REMOTE_ADDR is 127.0.0.1 for every
+# request behind a reverse proxy, so ALLOWED_IPS alone protects nothing).
+METRICS = {
+    "ENABLED": True,
+    "MULTIPROCESS_DIR": os.environ.get("METRICS_MULTIPROC_DIR"),
+    "FLUSH_INTERVAL": 5,
+    "TOKEN": os.environ.get("METRICS_TOKEN"),
+    "ALLOW_WITHOUT_TOKEN": False,
+    "ALLOWED_IPS": ["127.0.0.1", "::1"],
+}
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.mysql",
@@ -166,6 +341,27 @@ DATABASES = {
     }
 }
 
+# 🗄️ Tenant shards (core/sharding.py). Models of TENANT_APPS are stored on the
+# database named by their institute's `db_alias`; everything else stays on
+# "default". Extra aliases come from TENANT_SHARDS, e.g.
+#
+#     TENANT_SHARDS=shard1,shard2 python manage.py migrate --database shard1
+#
+# gives one local sqlite file per shard for development. In production add
+# the shard connections here and give each one a disjoint id range.
+DATABASE_ROUTERS = ["core.sharding.TenantRouter"]
+TENANT_APPS = ["marketplace", "orders", "issues", "notifications", "sync", "tasks"]
+
+for _alias in filter(None, os.environ.get("TENANT_SHARDS", "").split(",")):
+    DATABASES[_alias.strip()] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / f"{_alias.strip()}.sqlite3",
+    }
+
+
+# /api/schema/ serves the schema stored here by `manage.py build_schema`
+# (or built on first use), one file per code version (core/schema.py).
+OPENAPI_SCHEMA_DIR = BASE_DIR / "schema"
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Campus API",
@@ -0,0 +1,150 @@
+"""
+Tenant sharding.
+
+Every institute lives on one database alias (`Institute.db_alias`). Models of
+the apps in settings.TENANT_APPS are routed to that alias; everything else
+(auth, accounts, token blacklist, sessions) stays on "default".
+
+The alias is picked, in order, from:
+
+  1. the instance a query is about (related managers, saving an object
+     that was loaded from a shard),
+  2. an `Institute` passed as a hint (`Listing(institute=...)` resolves
+     its database from the institute it is assigned),
+  3. the tenant of the current request, set by core.authentication right
+     after the profile is loaded (or with `use_tenant()` in scripts).
+
+Shards need to JOIN tenant rows against users and institutes, so
+`Institute`, `User` and `Profile` rows are mirrored from "default" onto the
+shard of their institute (accounts/signals.py). Primary keys are copied
+as-is, so shards must hand out disjoint id ranges (e.g. MySQL
+auto_increment_offset / a per-shard AUTO_INCREMENT start).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from graphlib import TopologicalSorter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_tenant_db = ContextVar("tenant_db", default=None)
+
+
+def tenant_apps():
+    return getattr(settings, "TENANT_APPS", ())
+
+
+def is_tenant_model(model):
+    return model._meta.app_label in tenant_apps()
+
+
+def shard_aliases():
+    """Every configured alias other than "default"."""
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def current_alias():
+    return _tenant_db.get() or DEFAULT_DB_ALIAS
+
+
+def activate(institute):
+    """Route tenant queries of the current context to `institute`'s shard."""
+    return _tenant_db.set(institute.db_alias)
+
+
+@contextmanager
+def use_tenant(institute):
+    token = activate(institute)
+    try:
+        yield institute.db_alias
+    finally:
+        _tenant_db.reset(token)
+
+
+class TenantMiddleware:
+    """Clears the tenant between requests served by the same thread."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _tenant_db.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            _tenant_db.reset(token)
+
+
+class TenantRouter:
+    def _route(self, model, **hints):
+        if not is_tenant_model(model):
+            return None
+
+        instance = hints.get("instance")
+        if instance is not None:
+            if is_tenant_model(type(instance)) and instance._state.db:
+                return instance._state.db
+            alias = getattr(instance, "db_alias", None)
+            if alias:
+                return alias
+        return current_alias()
+
+    db_for_read = _route
+    db_for_write = _route
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # shared rows are mirrored onto every shard that references them
+        if not (is_tenant_model(type(obj1)) and is_tenant_model(type(obj2))):
+            return True
+        return None
+
+
+# =========================
+# COPYING ROWS BETWEEN DATABASES
+# =========================
+def copy_rows(model, objs, alias):
+    """
+    INSERT `objs` into `alias` unchanged. Runs as a raw insert (like
+    loaddata), so auto_now / auto_now_add fields keep their values.
+    """
+    if objs:
+        model._base_manager.db_manager(alias)._insert(
+            objs, fields=model._meta.local_concrete_fields, using=alias, raw=True,
+        )
+
+
+def mirror(instance, alias):
+    """Upsert a copy of `instance` on `alias` without touching its _state."""
+    model = type(instance)
+    copy = model(**{f.attname: getattr(instance, f.attname) for f in model._meta.concrete_fields})
+    copy.save_base(raw=True, using=alias)
+
+
+def tenant_models():
+    """Tenant models ordered so FK targets come before the rows pointing at them."""
+    models = [model for model in apps.get_models() if is_tenant_model(model)]
+    graph = {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.is_relation and field.related_model is not model
+            and field.related_model in models
+        }
+        for model in models
+    }
+    return list(TopologicalSorter(graph).static_order())
+
+
+def institute_lookup(model):
+    """ORM path from `model` to its institute, e.g. "listing__institute"."""
+    names = {field.name for field in model._meta.concrete_fields}
+    if "institute" in names:
+        return "institute"
+
+    for field in model._meta.concrete_fields:
+        if field.many_to_one and is_tenant_model(field.related_model) and field.related_model is not model:
+            path = institute_lookup(field.related_model)
+            if path:
+                return f"{field.name}__{path}"
+    return None
@@ -0,0 +1,76 @@
+"""
+A small DDSketch: mergeable quantile estimates with bounded relative error.
+
+Values are counted in logarithmic buckets of ratio gamma = (1 + a) / (1 - a).
+Any quantile is then returned within a factor `a` (RELATIVE_ACCURACY) of the
+true value, however many values were added. The state is a dict of bucket
+counts, small enough to keep in a JSON column and update one value at a time.
+
+Masson et al., "DDSketch: A Fast and Fully-Mergeable Quantile Sketch with
+Relative-Error Guarantees", VLDB 2019.
+"""
+import math
+
+
+RELATIVE_ACCURACY = 0.01
+MAX_BUCKETS = 2048
+MIN_VALUE = 1e-3  # smaller values (and zero) share one bucket
+
+
+class DDSketch:
+    def __init__(self, state=None, relative_accuracy=RELATIVE_ACCURACY):
+        state = state or {}
+        self.relative_accuracy = state.get("accuracy", relative_accuracy)
+        self.gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.zero = state.get("zero", 0)
+        self.buckets = {int(key): count for key, count in state.get("buckets", {}).items()}
+
+    @property
+    def count(self):
+        return self.zero + sum(self.buckets.values())
+
+    def add(self, value, count=1):
+        if value <= MIN_VALUE:
+            self.zero += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > MAX_BUCKETS:
+            self._collapse()
+
+    def merge(self, other):
+        self.zero += other.zero
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        while len(self.buckets) > MAX_BUCKETS:
+            self._collapse()
+
+    def _collapse(self):
+        # fold the two lowest buckets: only the smallest values lose accuracy
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def quantile(self, q):
+        """Estimated q-quantile (0 <= q <= 1), None when empty."""
+        total = self.count
+        if total == 0:
+            return None
+
+        rank = q * (total - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # midpoint (in relative terms) of (gamma**(key-1), gamma**key]
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            "accuracy": self.relative_accuracy,
+            "zero": self.zero,
+            "buckets": {str(key): count for key, count in self.buckets.items()},
+        }
@@ -0,0 +1,86 @@
+import io
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+
+from .parsers import JSONParser
+from .renderers import JSONRenderer, orjson
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class JSONParserTests(SimpleTestCase):
+    """The orjson parser must return exactly what DRF's own parser does."""
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), "application/json", {"encoding": "utf-8"})
+
+    def assertSameAsDRF(self, body):
+        expected = self.parse(parsers.JSONParser(), body)
+        parsed = self.parse(JSONParser(), body)
+        self.assertEqual(parsed, expected)
+        self.assertEqual(repr(parsed), repr(expected))  # 1 == 1.0, so compare types too
+
+    def test_plain_bodies(self):
+        for body in (
+            b'{"title": "Cycle", "price": 1500, "tags": ["a", "b"], "used": true, "note": null}',
+            '{"title": "किताब ✓"}'.encode(),
+            b'{"price": 12.5, "max": 9223372036854775807}',
+        ):
+            self.assertSameAsDRF(body)
+
+    def test_integers_wider_than_64_bits(self):
+        for body in (
+            b'{"a": 12345678901234567890123}',
+            b'{"a": 18446744073709551616}',
+            b'{"a": -9223372036854775809}',
+            b'[1, 2, 99999999999999999999999999999]',
+        ):
+            self.assertSameAsDRF(body)
+        self.assertEqual(self.parse(JSONParser(), b'{"a": 12345678901234567890123}'), {"a": 12345678901234567890123})
+
+    def test_long_digit_runs_in_strings(self):
+        self.assertSameAsDRF(b'{"phone": "12345678901234567890", "n": 1}')
+
+    def test_out_of_range_float(self):
+        self.assertSameAsDRF(b'{"a": 1e400}')
+
+    def test_invalid_bodies(self):
+        for body in (b'{"a": NaN}', b'{"a": Infinity}', b'{"a": ', b"\xff"):
+            with self.assertRaises(ParseError):
+                self.parse(parsers.JSONParser(), body)
+            with self.assertRaises(ParseError):
+                self.parse(JSONParser(), body)
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class JSONRendererTests(SimpleTestCase):
+    """The orjson renderer must write the same bytes (or fail the same way) as DRF's."""
+
+    def assertSameAsDRF(self, data):
+        self.assertEqual(JSONRenderer().render(data), renderers.JSONRenderer().render(data))
+
+    def test_plain_payloads(self):
+        self.assertSameAsDRF({
+            "count": 2,
+            "next": None,
+            "results": [
+                {"id": 1, "title": "Cycle ✓", "price": Decimal("12.50"), "ok": True},
+                {"id": 2, "created_at": datetime(2026, 10, 19, 10, 0, tzinfo=timezone.utc), "ratio": 0.5},
+            ],
+            "line": "a b c",
+        })
+
+    def test_integers_wider_than_64_bits(self):
+        self.assertSameAsDRF({"a": 12345678901234567890123, "b": None})
+
+    def test_non_finite_floats_raise(self):
+        for value in (float("nan"), float("inf"), float("-inf")):
+            data = {"results": [{"score": value, "note": None}]}
+            with self.assertRaises(ValueError):
+                renderers.JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
@@ -0,0 +1,105 @@
+"""
+Cache-backed token-bucket throttles.
+
+Budgets live in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] under
+"<view.throttle_scope>.<kind>", e.g. "login.ip": "10/min" means a bucket
+of 10 tokens per client IP that refills at 10 per minute. A scope/kind
+without a configured rate is not throttled.
+
+Each bucket is a single cache entry holding (tokens, last_refill). Buckets
+are only as shared as the cache: with the default per-process LocMemCache
+every worker process keeps its own, so N workers allow up to N times the
+configured budget. Configure a shared CACHES backend (Redis, Memcached)
+in production. Even then the read-modify-write is not atomic, so a burst
+may let a request or two more through than configured, never fewer.
+
+Client IPs are REMOTE_ADDR. X-Forwarded-For is only used when
+REST_FRAMEWORK["NUM_PROXIES"] says how many proxies to trust; otherwise a
+client could send a new address with every request and get a fresh bucket.
+"""
+import time
+
+from django.core.cache import cache as default_cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (capacity 10, refill 10/60 tokens per second)."""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    kind = None
+    cache = default_cache
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_bucket_ident(self, request, view):
+        raise NotImplementedError
+
+    def get_ident(self, request):
+        # BaseThrottle.get_ident trusts any X-Forwarded-For when NUM_PROXIES is unset
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get("REMOTE_ADDR")
+        return super().get_ident(request)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}.{self.kind}") if scope else None
+        if rate is None:
+            return True
+
+        ident = self.get_bucket_ident(request, view)
+        if ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        key = f"throttle:{scope}:{self.kind}:{ident}"
+        now = time.time()
+
+        state = self.cache.get(key)
+        tokens = capacity if state is None else min(capacity, state[0] + (now - state[1]) * refill)
+
+        # the entry can expire once the bucket would be full again
+        timeout = int(capacity / refill) + 1
+        if tokens < 1:
+            self.wait_time = (1 - tokens) / refill
+            self.cache.set(key, (tokens, now), timeout)
+            return False
+
+        self.cache.set(key, (tokens - 1, now), timeout)
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    kind = "ip"
+
+    def get_bucket_ident(self, request, view):
+        return self.get_ident(request)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    kind = "user"
+
+    def get_bucket_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return f"ip-{self.get_ident(request)}"
+
+
+class InstituteTokenBucketThrottle(TokenBucketThrottle):
+    kind = "institute"
+
+    def get_bucket_ident(self, request, view):
+        profile = getattr(request.user, "profile", None) if request.user.is_authenticated else None
+        return profile.institute_id if profile is not None else None
@@ -1,10 +1,14 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 
 from django.conf import settings
-from django.conf.urls.static import static
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
+
+from core.batch import BatchView
+from core.media import serve_media
+from core.metrics import metrics_view
+from core.schema import CachedSchemaView
 
 
 urlpatterns = [
@@ -17,10 +21,17 @@ urlpatterns = [
     path("api/", include("issues.urls")),
     path("api/", include("notifications.urls")),
 
+    # 🔁 several GETs in one round trip (page bootstraps)
+    path("api/batch/", BatchView.as_view(), name="batch"),
+
 
     # ✅ Swagger Docs
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSchemaView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
 
+    # 📊 Prometheus metrics (local scrapers only)
+    path("metrics/", metrics_view, name="metrics"),
 
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # 🖼️ Uploaded media (mode picked by settings.MEDIA_SERVING)
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", serve_media, name="media"),
+]
@@ -1,6 +1,32 @@
 from django.contrib import admin
 
-# Register your models here.
-from .models import Issue
+from core.admin import LargeTableAdmin
 
-admin.site.register(Issue)
\ No newline at end of file
+from .models import Issue, IssueEvent, IssueSLAStat
+
+
+@admin.register(Issue)
+class IssueAdmin(LargeTableAdmin):
+    list_display = ["id", "title", "institute", "created_by", "status", "priority", "created_at"]
+    list_select_related = ["institute", "created_by"]
+    list_filter = ["status", "priority"]
+    search_fields = ["=id", "^title"]
+    raw_id_fields = ["created_by"]
+    autocomplete_fields = ["institute"]
+
+
+@admin.register(IssueEvent)
+class IssueEventAdmin(LargeTableAdmin):
+    list_display = ["id", "issue", "actor", "from_status", "to_status", "from_priority", "to_priority", "created_at"]
+    list_select_related = ["issue__institute", "actor"]
+    search_fields = ["=issue__id"]
+    raw_id_fields = ["issue", "actor"]
+    autocomplete_fields = ["institute"]
+
+
+@admin.register(IssueSLAStat)
+class IssueSLAStatAdmin(admin.ModelAdmin):
+    list_display = ["institute", "category", "metric", "count", "updated_at"]
+    list_select_related = ["institute"]
+    list_filter = ["metric"]
+    readonly_fields = ["count", "total_seconds", "sketch"]
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_institute_db_alias'),
+        ('issues', '0002_title_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='acknowledged_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='resolved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='IssueEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('RESOLVED', 'Resolved')], max_length=20)),
+                ('to_status', models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('RESOLVED', 'Resolved')], max_length=20)),
+                ('from_priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High')], max_length=20)),
+                ('to_priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='issue_events', to=settings.AUTH_USER_MODEL)),
+                ('institute', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issue_events', to='accounts.institute')),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='issues.issue')),
+            ],
+            options={
+                'ordering': ['issue', 'id'],
+                'indexes': [models.Index(fields=['issue', 'id'], name='issue_event_issue_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='IssueSLAStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=100)),
+                ('metric', models.CharField(choices=[('ACKNOWLEDGE', 'Time to acknowledge'), ('RESOLVE', 'Time to resolve')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.FloatField(default=0.0)),
+                ('sketch', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('institute', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issue_sla_stats', to='accounts.institute')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('institute', 'category', 'metric'), name='issue_sla_stat_unique')],
+            },
+        ),
+    ]
@@ -29,8 +29,74 @@ class Issue(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # 📊 first time the issue left OPEN / first time it was RESOLVED (issues/sla.py)
+    acknowledged_at = models.DateTimeField(null=True, blank=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["title"], name="issue_title_idx"),  # admin ^title search
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.status}) - {self.institute.code}"
+
+
+# =========================
+# STATUS HISTORY + SLA
+# =========================
+class IssueEvent(models.Model):
+    """Append-only log of status / priority changes, one row per update."""
+
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="issue_events")
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="events")
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="issue_events")
+
+    from_status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    from_priority = models.CharField(max_length=20, choices=Issue.PRIORITY_CHOICES)
+    to_priority = models.CharField(max_length=20, choices=Issue.PRIORITY_CHOICES)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["issue", "id"]
+        indexes = [
+            models.Index(fields=["issue", "id"], name="issue_event_issue_idx"),
+        ]
+
+    def __str__(self):
+        return f"Issue #{self.issue_id}: {self.from_status} -> {self.to_status}"
+
+
+class IssueSLAStat(models.Model):
+    """
+    Running time-to-acknowledge / time-to-resolve figures for one institute
+    and category ("" = all categories), updated as issues move.
+    """
+
+    ACKNOWLEDGE = "ACKNOWLEDGE"
+    RESOLVE = "RESOLVE"
+    METRIC_CHOICES = [
+        (ACKNOWLEDGE, "Time to acknowledge"),
+        (RESOLVE, "Time to resolve"),
+    ]
+
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="issue_sla_stats")
+    category = models.CharField(max_length=100, blank=True)
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+
+    count = models.PositiveIntegerField(default=0)
+    total_seconds = models.FloatField(default=0.0)
+    sketch = models.JSONField(default=dict)  # core.sketch.DDSketch state
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["institute", "category", "metric"], name="issue_sla_stat_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.institute.code} {self.category or '*'} {self.metric}"
@@ -1,11 +1,16 @@
+from django.db import transaction
 from rest_framework import serializers
+from core.mixins import SparseFieldsSerializerMixin
 from .models import Issue
+from .sla import record_transition
 
 
 # =========================
 # READ SERIALIZER
 # =========================
-class IssueReadSerializer(serializers.ModelSerializer):
+class IssueReadSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ["created_by"]
+
     # ADD THIS - Show who created the issue
     created_by = serializers.SerializerMethodField()
     
@@ -25,6 +30,37 @@ class IssueReadSerializer(serializers.ModelSerializer):
             'last_name': obj.created_by.last_name,
         }
 
+# Fast read path for list actions: same output as IssueReadSerializer,
+# built from .values() rows.
+_datetime = serializers.DateTimeField()
+
+ISSUE_VALUES = (
+    "id", "title", "description", "category", "status", "priority", "created_at",
+    "created_by_id", "created_by__username", "created_by__first_name", "created_by__last_name",
+)
+
+
+def serialize_issue_rows(rows):
+    """Fast equivalent of IssueReadSerializer(issues, many=True).data for ISSUE_VALUES rows."""
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "category": row["category"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "created_at": _datetime.to_representation(row["created_at"]),
+            "created_by": {
+                "id": row["created_by_id"],
+                "username": row["created_by__username"],
+                "first_name": row["created_by__first_name"],
+                "last_name": row["created_by__last_name"],
+            },
+        }
+        for row in rows
+    ]
+
 # =========================
 # CREATE SERIALIZER
 # =========================
@@ -62,3 +98,13 @@ class IssueAdminUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Issue
         fields = ["status", "priority"]
+
+    def update(self, instance, validated_data):
+        # 📊 every change lands in the issue's event log (issues/sla.py)
+        from_status, from_priority = instance.status, instance.priority
+        request = self.context.get("request")
+
+        with transaction.atomic(using=instance._state.db):
+            issue = super().update(instance, validated_data)
+            record_transition(issue, request.user if request else None, from_status, from_priority)
+        return issue
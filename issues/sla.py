@@ -0,0 +1,95 @@
+"""
+Issue status history and SLA figures.
+
+Every status / priority change writes an IssueEvent. The first time an issue
+leaves OPEN (acknowledged) and the first time it is RESOLVED, the elapsed
+time since it was reported is folded into IssueSLAStat rows for its
+category and for the institute as a whole: a count, a running total (for
+the mean) and a DDSketch (for p50 / p90). Reading the figures is then one
+small query, whatever the size of the issue history.
+
+Only transitions that are actually seen count. Issues reported before
+this was added have no acknowledged_at / resolved_at; one that is
+already IN_PROGRESS or RESOLVED adds no sample when it is later edited,
+because its real acknowledgement or resolution time is unknown.
+"""
+from django.db import transaction
+
+from core.sketch import DDSketch
+
+from .models import Issue, IssueEvent, IssueSLAStat
+
+
+QUANTILES = {"p50_seconds": 0.5, "p90_seconds": 0.9}
+
+
+def record_transition(issue, actor, from_status, from_priority):
+    """
+    Log an update of `issue` (already saved) from the given status / priority.
+    Runs in the caller's transaction when there is one.
+    """
+    if issue.status == from_status and issue.priority == from_priority:
+        return None
+
+    alias = issue._state.db
+    with transaction.atomic(using=alias):
+        event = IssueEvent.objects.using(alias).create(
+            institute_id=issue.institute_id,
+            issue=issue,
+            actor=actor,
+            from_status=from_status,
+            to_status=issue.status,
+            from_priority=from_priority,
+            to_priority=issue.priority,
+        )
+        if from_status == "OPEN" and issue.status != "OPEN":
+            _first_time(issue, "acknowledged_at", IssueSLAStat.ACKNOWLEDGE, event.created_at)
+        if from_status != "RESOLVED" and issue.status == "RESOLVED":
+            _first_time(issue, "resolved_at", IssueSLAStat.RESOLVE, event.created_at)
+    return event
+
+
+def _first_time(issue, field, metric, when):
+    # the conditional UPDATE lets exactly one concurrent update claim it
+    claimed = Issue.objects.using(issue._state.db).filter(
+        pk=issue.pk, **{f"{field}__isnull": True},
+    ).update(**{field: when})
+    if claimed:
+        setattr(issue, field, when)
+        add_sample(issue, metric, (when - issue.created_at).total_seconds())
+
+
+def add_sample(issue, metric, seconds):
+    alias = issue._state.db
+    # "" (all categories) first, so concurrent updates lock rows in one order
+    for category in sorted({"", issue.category}):
+        stat, _ = IssueSLAStat.objects.using(alias).select_for_update().get_or_create(
+            institute_id=issue.institute_id, category=category, metric=metric,
+        )
+        sketch = DDSketch(stat.sketch)
+        sketch.add(seconds)
+        stat.count += 1
+        stat.total_seconds += seconds
+        stat.sketch = sketch.to_dict()
+        stat.save(update_fields=["count", "total_seconds", "sketch", "updated_at"])
+
+
+def _figures(stat):
+    sketch = DDSketch(stat.sketch)
+    figures = {"count": stat.count, "mean_seconds": round(stat.total_seconds / stat.count, 1)}
+    for name, q in QUANTILES.items():
+        figures[name] = round(sketch.quantile(q), 1)
+    return figures
+
+
+def sla_summary(institute):
+    """{"overall": {...}, "categories": [{...}, ...]} for the sla endpoint."""
+    entries = {}
+    for stat in IssueSLAStat.objects.filter(institute=institute, count__gt=0).order_by("category"):
+        entry = entries.setdefault(stat.category, {
+            "category": stat.category or None, "acknowledge": None, "resolve": None,
+        })
+        entry[stat.metric.lower()] = _figures(stat)
+
+    overall = entries.pop("", {"category": None, "acknowledge": None, "resolve": None})
+    return {"overall": overall, "categories": list(entries.values())}
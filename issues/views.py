@@ -5,16 +5,38 @@ from .permissions import IsIssueOwnerOrReadOnly, IsFacultyOrStaff
 
 
 from .models import Issue
+from .sla import sla_summary
 from .serializers import (
     IssueReadSerializer,
     IssueCreateSerializer,
     IssueAdminUpdateSerializer,
+    ISSUE_VALUES,
+    serialize_issue_rows,
 )
 
-from notifications.utils import create_notification
+from notifications.jobs import send_notification
+from core.exports import export_response
+from core.mixins import SparseFieldsViewMixin, sparse_params
+from sync.views import ChangesMixin
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("category", "category"),
+    ("status", "status"),
+    ("priority", "priority"),
+    ("created_at", "created_at"),
+    ("created_by_id", "created_by_id"),
+    ("created_by_username", "created_by__username"),
+]
+
+
+class IssueViewSet(ChangesMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
+    sync_kind = "issues"
 
     def get_permissions(self):
     # Everyone must be authenticated
@@ -25,7 +47,7 @@ class IssueViewSet(viewsets.ModelViewSet):
             ]
 
         # Faculty/Staff-only actions
-        if self.action in ["update", "partial_update", "admin_update"]:
+        if self.action in ["update", "partial_update", "admin_update", "sla"]:
             return [
                 permissions.IsAuthenticated(),
                 IsFacultyOrStaff(),
@@ -42,12 +64,47 @@ class IssueViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
     filterset_fields = ["status", "priority", "category"]
 
+    # ✂️ ?fields= / ?expand= only load the relations they render
+    sparse_select_related = {"created_by": ["created_by"]}
+
     # 🔐 institute isolation
     def get_queryset(self):
         return Issue.objects.filter(
             institute=self.request.user.profile.institute
         )
 
+    # ⚡ list reads rows with .values() and skips ModelSerializer machinery
+    def list(self, request, *args, **kwargs):
+        if sparse_params(request) is not None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.filter_queryset(self.get_queryset()).values(*ISSUE_VALUES)
+
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(serialize_issue_rows(list(rows)))
+        return self.get_paginated_response(serialize_issue_rows(page))
+
+    # 📤 audit export: same filters as list, streamed as CSV / JSONL
+    @extend_schema(
+        parameters=[OpenApiParameter("export_format", str, enum=["csv", "jsonl"])],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=["GET"])
+    def export(self, request):
+        return export_response(
+            self.filter_queryset(self.get_queryset()),
+            EXPORT_COLUMNS,
+            filename="issues",
+            export_format=request.query_params.get("export_format", "csv"),
+        )
+
+    # 📊 time-to-acknowledge / time-to-resolve, kept up to date by admin updates
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["GET"])
+    def sla(self, request):
+        return Response(sla_summary(request.user.profile.institute))
+
     # 🔁 serializer switching
     def get_serializer_class(self):
         if self.action == "create":
@@ -78,16 +135,20 @@ class IssueViewSet(viewsets.ModelViewSet):
             )
 
         serializer = IssueAdminUpdateSerializer(
-            issue, data=request.data, partial=True
+            issue, data=request.data, partial=True, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        create_notification(
-            institute=issue.institute,
-            user=issue.created_by,
+        send_notification.enqueue(
+            issue.institute,
+            user_id=issue.created_by_id,
             title="Issue Updated",
             message=f"Your issue '{issue.title}' status is now {issue.status}.",
+            kind="issue_update",
+            subject=f"issue:{issue.id}",
+            summary="Your issue '{title}' was updated {count} times; status is now {status}.",
+            summary_args={"title": issue.title, "status": issue.status},
         )
 
         return Response(IssueReadSerializer(issue).data)
@@ -1,8 +1,87 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import LargeTableAdmin
 
-from .models import Category, Listing, ListingImage
-admin.site.register(Category)
-admin.site.register(Listing)
-admin.site.register(ListingImage)
+from .models import (
+    ArchivedListing,
+    ArchivedListingImage,
+    Category,
+    InstituteStorageUsage,
+    Listing,
+    ListingImage,
+    SavedSearch,
+    UserStorageUsage,
+)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ["name", "institute"]
+    list_select_related = ["institute"]
+    search_fields = ["^name"]
+    autocomplete_fields = ["institute"]
+
+
+class ListingImageInline(admin.TabularInline):
+    model = ListingImage
+    extra = 0
+
+
+@admin.register(Listing)
+class ListingAdmin(LargeTableAdmin):
+    list_display = ["id", "title", "institute", "owner", "category", "price", "status", "view_count", "created_at"]
+    list_select_related = ["institute", "owner", "category__institute"]
+    list_filter = ["status"]
+    search_fields = ["=id", "^title"]
+    raw_id_fields = ["owner"]
+    autocomplete_fields = ["institute", "category"]
+    readonly_fields = ["view_count", "popularity"]
+    inlines = [ListingImageInline]
+
+
+@admin.register(ListingImage)
+class ListingImageAdmin(LargeTableAdmin):
+    list_display = ["id", "listing", "image", "size", "created_at"]
+    list_select_related = ["listing__institute"]
+    search_fields = ["=listing__id"]
+    raw_id_fields = ["listing"]
+
+
+class ArchivedListingImageInline(admin.TabularInline):
+    model = ArchivedListingImage
+    extra = 0
+
+
+@admin.register(ArchivedListing)
+class ArchivedListingAdmin(LargeTableAdmin):
+    list_display = ["id", "title", "institute", "owner", "price", "sold_at", "archived_at"]
+    list_select_related = ["institute", "owner"]
+    search_fields = ["=id"]
+    raw_id_fields = ["owner", "category"]
+    autocomplete_fields = ["institute"]
+    inlines = [ArchivedListingImageInline]
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(LargeTableAdmin):
+    list_display = ["id", "user", "institute", "keywords", "category", "min_price", "max_price", "created_at"]
+    list_select_related = ["user", "institute", "category__institute"]
+    search_fields = ["^user__username"]
+    raw_id_fields = ["user"]
+    autocomplete_fields = ["institute", "category"]
+
+
+@admin.register(UserStorageUsage)
+class UserStorageUsageAdmin(LargeTableAdmin):
+    list_display = ["user", "institute", "bytes", "files", "updated_at"]
+    list_select_related = ["user", "institute"]
+    search_fields = ["^user__username"]
+    raw_id_fields = ["user"]
+    autocomplete_fields = ["institute"]
+
+
+@admin.register(InstituteStorageUsage)
+class InstituteStorageUsageAdmin(admin.ModelAdmin):
+    list_display = ["institute", "bytes", "files", "updated_at"]
+    list_select_related = ["institute"]
+    autocomplete_fields = ["institute"]
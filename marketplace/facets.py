@@ -0,0 +1,86 @@
+"""
+Faceted counts for marketplace browsing.
+
+All three facets (category, status, price bucket) come from a single
+GROUP BY over the filtered listing queryset; results can be cached for a
+few seconds per institute + filter combination.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+
+def price_bounds():
+    return list(getattr(settings, "LISTING_PRICE_BUCKETS", [500, 1000, 2500, 5000, 10000]))
+
+
+def price_bucket_expression(bounds):
+    return Case(
+        *[When(price__lt=upper, then=Value(index)) for index, upper in enumerate(bounds)],
+        default=Value(len(bounds)),
+        output_field=IntegerField(),
+    )
+
+
+def compute_facets(queryset):
+    bounds = price_bounds()
+    rows = (
+        queryset.order_by()
+        .annotate(price_bucket=price_bucket_expression(bounds))
+        .values("category_id", "category__name", "status", "price_bucket")
+        .annotate(n=Count("id"))
+    )
+
+    total = 0
+    categories, statuses = {}, {}
+    buckets = [0] * (len(bounds) + 1)
+    for row in rows:
+        total += row["n"]
+        key = (row["category_id"], row["category__name"])
+        categories[key] = categories.get(key, 0) + row["n"]
+        statuses[row["status"]] = statuses.get(row["status"], 0) + row["n"]
+        buckets[row["price_bucket"]] += row["n"]
+
+    lower_bounds = [0] + bounds
+    return {
+        "count": total,
+        "categories": [
+            {"id": category_id, "name": name, "count": count}
+            for (category_id, name), count in sorted(categories.items(), key=lambda item: (item[0][1] is None, item[0][1] or ""))
+        ],
+        "status": [{"value": value, "count": count} for value, count in sorted(statuses.items())],
+        "price": [
+            {
+                "min": lower,
+                "max": bounds[index] - 1 if index < len(bounds) else None,
+                "count": buckets[index],
+            }
+            for index, lower in enumerate(lower_bounds)
+        ],
+    }
+
+
+def cached_facets(queryset, institute, params):
+    """
+    compute_facets() behind a short per-institute cache keyed by the
+    filter parameters (settings.LISTING_FACETS_CACHE_TIMEOUT, 0 = off).
+    """
+    timeout = getattr(settings, "LISTING_FACETS_CACHE_TIMEOUT", 30)
+    if not timeout:
+        return compute_facets(queryset)
+
+    normalized = "&".join(
+        f"{name}={value}"
+        for name, values in sorted(params.lists())
+        if name not in ("page", "ordering")
+        for value in sorted(values)
+    )
+    key = f"listing-facets:{institute.id}:{hashlib.md5(normalized.encode()).hexdigest()}"
+
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, timeout)
+    return facets
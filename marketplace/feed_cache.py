@@ -0,0 +1,112 @@
+"""
+Cache for the default marketplace feed.
+
+The first few pages of `GET /api/listings/` (optionally `?status=AVAILABLE`,
+default ordering, no search/filters) are identical for everyone in an
+institute, so their response data is cached per institute. Entries are
+keyed by a per-institute version number that signals bump whenever a
+listing, listing image or category changes (marketplace/signals.py), so
+invalidation never has to find the stale keys. The bump has to reach every
+worker, so the feed is only cached with a shared CACHES backend; with the
+default per-process cache every request reads the database.
+
+A miss takes a short lock before rebuilding the page; concurrent misses
+wait briefly for that result instead of all hitting the database.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from accounts.blacklist import _shared_cache
+from core.metrics import counter
+
+
+FEED_CACHE = counter(
+    "listing_feed_cache_total",
+    "Default listing feed cache lookups by result (hit, miss, wait_hit).",
+    ["result"],
+)
+
+_DEFAULTS = {
+    "ENABLED": True,
+    "TIMEOUT": 60,
+    "PAGES": 3,
+    "LOCK_TIMEOUT": 5,
+    "LOCK_WAIT": 0.5,
+}
+
+
+def _config(name):
+    return getattr(settings, "LISTING_FEED_CACHE", {}).get(name, _DEFAULTS[name])
+
+
+def _version_key(institute_id):
+    return f"listing-feed:{institute_id}:version"
+
+
+def feed_version(institute_id):
+    key = _version_key(institute_id)
+    version = cache.get(key)
+    if version is None:
+        # start from the clock so a lost version key never revives old entries
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def invalidate_feed(institute_id):
+    try:
+        cache.incr(_version_key(institute_id))
+    except ValueError:
+        feed_version(institute_id)
+
+
+def cache_key(request):
+    """Key for a cacheable default-feed request, or None if it is not one."""
+    if not _config("ENABLED") or not _shared_cache():
+        return None
+
+    params = request.query_params
+    if set(params) - {"page", "status"} or params.get("status", "AVAILABLE") != "AVAILABLE":
+        return None
+
+    page = params.get("page", "1")
+    if not page.isdigit() or not 1 <= int(page) <= _config("PAGES"):
+        return None
+
+    institute_id = request.user.profile.institute_id
+    return (
+        f"listing-feed:{institute_id}:v{feed_version(institute_id)}:"
+        f"{params.get('status', '')}:{page}:{request.scheme}://{request.get_host()}"
+    )
+
+
+def get_or_build(key, build):
+    data = cache.get(key)
+    if data is not None:
+        FEED_CACHE.inc("hit")
+        return data
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, _config("LOCK_TIMEOUT")):
+        try:
+            FEED_CACHE.inc("miss")
+            data = build()
+            cache.set(key, data, _config("TIMEOUT"))
+            return data
+        finally:
+            cache.delete(lock_key)
+
+    # someone else is rebuilding this page: wait a little for their result
+    deadline = time.monotonic() + _config("LOCK_WAIT")
+    while time.monotonic() < deadline:
+        time.sleep(0.02)
+        data = cache.get(key)
+        if data is not None:
+            FEED_CACHE.inc("wait_hit")
+            return data
+
+    FEED_CACHE.inc("miss")
+    return build()
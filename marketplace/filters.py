@@ -0,0 +1,21 @@
+import django_filters
+
+from .models import Listing
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
+class ListingFilter(django_filters.FilterSet):
+    """
+    ?status=AVAILABLE&category=3,7&min_price=500&max_price=3000
+    (`price` keeps the old exact match.)
+    """
+    min_price = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
+    max_price = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
+    category = NumberInFilter(field_name="category_id", lookup_expr="in")
+
+    class Meta:
+        model = Listing
+        fields = ["status", "price", "category", "min_price", "max_price"]
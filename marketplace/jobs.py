@@ -0,0 +1,8 @@
+from tasks.queue import task
+
+from .matching import notify_matches
+
+
+@task()
+def match_saved_searches(institute, listing_id):
+    notify_matches(listing_id, institute.pk)
@@ -0,0 +1,123 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from marketplace.feed_cache import invalidate_feed
+from marketplace.models import ArchivedListing, ArchivedListingImage, Listing, ListingImage
+from orders.models import Order
+from sync.changes import record
+
+
+OPEN_ORDER_STATUSES = ["PENDING", "ACCEPTED"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Move SOLD listings older than --days out of the live listings table "
+        "into the archive tables, on every database alias. Works in small "
+        "batches, one short transaction each; orders are repointed at the "
+        "archived copy, so order history reads the same."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=getattr(settings, "LISTING_ARCHIVE_AFTER_DAYS", 90),
+            help="archive listings sold more than this many days ago (default LISTING_ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="listings per transaction (default 500)")
+        parser.add_argument("--sleep", type=float, default=0.0, help="seconds to pause between batches")
+        parser.add_argument("--dry-run", action="store_true", help="only count what would be archived")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        for alias in settings.DATABASES:
+            queryset = self.candidates(alias, cutoff)
+            if options["dry_run"]:
+                self.stdout.write(f"{alias}: {queryset.count()} listings to archive")
+                continue
+
+            started = time.perf_counter()
+            total = 0
+            while True:
+                # always the lowest ids left: archived rows drop out of the queryset
+                ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:options["batch_size"]])
+                if not ids:
+                    break
+                total += self.archive(alias, ids)
+                if options["sleep"]:
+                    time.sleep(options["sleep"])
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{alias}: archived {total} listings in {time.perf_counter() - started:.1f}s"
+            ))
+
+    def candidates(self, alias, cutoff):
+        open_orders = Order.objects.using(alias).filter(listing=OuterRef("pk"), status__in=OPEN_ORDER_STATUSES)
+        return (
+            Listing.objects.using(alias)
+            .filter(status="SOLD")
+            # listings sold before sold_at existed fall back to their age
+            .filter(Q(sold_at__lt=cutoff) | Q(sold_at__isnull=True, created_at__lt=cutoff))
+            .filter(~Exists(open_orders))
+        )
+
+    def archive(self, alias, ids):
+        with transaction.atomic(using=alias):
+            # lock the batch; a listing that was edited meanwhile is skipped
+            listings = list(
+                Listing.objects.using(alias).select_for_update()
+                .filter(pk__in=ids, status="SOLD")
+            )
+            if not listings:
+                return 0
+            ids = [listing.pk for listing in listings]
+            images = list(ListingImage.objects.using(alias).filter(listing_id__in=ids))
+
+            ArchivedListing.objects.using(alias).bulk_create([
+                ArchivedListing(
+                    id=listing.pk,
+                    institute_id=listing.institute_id,
+                    owner_id=listing.owner_id,
+                    category_id=listing.category_id,
+                    title=listing.title,
+                    description=listing.description,
+                    price=listing.price,
+                    status=listing.status,
+                    view_count=listing.view_count,
+                    created_at=listing.created_at,
+                    sold_at=listing.sold_at,
+                )
+                for listing in listings
+            ])
+            ArchivedListingImage.objects.using(alias).bulk_create([
+                ArchivedListingImage(
+                    id=image.pk, listing_id=image.listing_id, image=image.image.name, size=image.size,
+                    created_at=image.created_at,
+                )
+                for image in images
+            ])
+
+            orders = Order.objects.using(alias).filter(listing_id__in=ids)
+            orders.update(archived_listing_id=F("listing_id"))
+            orders.update(listing=None)
+
+            # plain DELETE ... WHERE id IN (...): the collector would re-select
+            # every image and order just to find nothing left to cascade
+            ListingImage.objects.using(alias).filter(listing_id__in=ids)._raw_delete(alias)
+            Listing.objects.using(alias).filter(pk__in=ids)._raw_delete(alias)
+
+            by_institute = {}
+            for listing in listings:
+                by_institute.setdefault(listing.institute_id, []).append(listing.pk)
+            for institute_id, listing_ids in by_institute.items():
+                # gone from the live feed: tombstones for delta sync clients
+                record("listings", institute_id, listing_ids, deleted=True, using=alias)
+                transaction.on_commit(lambda pk=institute_id: invalidate_feed(pk), using=alias)
+
+        return len(listings)
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from core.benchmarks import best_of, rolled_back, seed_campus
+from issues.models import Issue
+from issues.serializers import IssueReadSerializer, ISSUE_VALUES, serialize_issue_rows
+from marketplace.models import Listing
+from marketplace.serializers import ListingSerializer, listing_values, serialize_listing_rows
+from orders.models import Order
+from orders.serializers import OrderSerializer, ORDER_VALUES, serialize_order_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark: ModelSerializer list output vs the .values() fast path. "
+        "Seeds data inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200, help="rows per list (default 200)")
+        parser.add_argument("--images", type=int, default=3, help="images per listing (default 3)")
+        parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (default 5)")
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+
+    def run(self, options):
+        institute = seed_campus(options["rows"], options["images"], code="BENCH-SER")
+        request = APIRequestFactory().get("/api/listings/", HTTP_HOST="localhost")
+        renderer = JSONRenderer()
+
+        listings = Listing.objects.filter(institute=institute).order_by("-id")
+        orders = Order.objects.filter(institute=institute).order_by("-id")
+        issues = Issue.objects.filter(institute=institute).order_by("-id")
+
+        cases = [
+            (
+                "listings",
+                lambda: ListingSerializer(
+                    listings.select_related("owner", "category").prefetch_related("images"),
+                    many=True, context={"request": request},
+                ).data,
+                lambda: serialize_listing_rows(list(listings.values(*listing_values())), request),
+            ),
+            (
+                "orders",
+                lambda: OrderSerializer(orders, many=True, context={"request": request}).data,
+                lambda: serialize_order_rows(list(orders.values(*ORDER_VALUES)), request),
+            ),
+            (
+                "issues",
+                lambda: IssueReadSerializer(issues, many=True, context={"request": request}).data,
+                lambda: serialize_issue_rows(list(issues.values(*ISSUE_VALUES))),
+            ),
+        ]
+
+        self.stdout.write(f"{'list':<10}{'serializer ms':>15}{'fast path ms':>15}{'speedup':>10}")
+        for name, slow, fast in cases:
+            if renderer.render(slow()) != renderer.render(fast()):
+                raise CommandError(f"{name}: fast path output differs from the serializer")
+
+            slow_ms = best_of(slow, options["repeat"])
+            fast_ms = best_of(fast, options["repeat"])
+            self.stdout.write(f"{name:<10}{slow_ms:>15.2f}{fast_ms:>15.2f}{slow_ms / fast_ms:>9.1f}x")
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+
+MODES = ["django", "stream", "x-accel"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Throughput of /media/ through the full Django stack for each "
+        "MEDIA_SERVING mode, on throwaway files in a temporary MEDIA_ROOT."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,2000", help="file sizes in KB, comma separated (default 100,2000)")
+        parser.add_argument("--requests", type=int, default=200, help="requests per case (default 200)")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+
+        with tempfile.TemporaryDirectory() as media_root:
+            os.makedirs(os.path.join(media_root, "listings"))
+            for size in sizes:
+                with open(os.path.join(media_root, "listings", f"bench-{size}.jpg"), "wb") as fh:
+                    fh.write(os.urandom(size * 1024))
+
+            self.stdout.write(f"{'case':<28}{'req/s':>10}{'MB/s':>10}{'ms/req':>10}")
+            for size in sizes:
+                url = f"/media/listings/bench-{size}.jpg"
+                for mode in MODES:
+                    self.report(f"{mode} {size}KB", media_root, mode, url, options["requests"])
+
+                self.report(f"stream {size}KB range 64KB", media_root, "stream", url,
+                            options["requests"], HTTP_RANGE="bytes=0-65535")
+                etag = self.fetch(media_root, "stream", url)["ETag"]
+                self.report(f"stream {size}KB 304", media_root, "stream", url,
+                            options["requests"], HTTP_IF_NONE_MATCH=etag)
+
+    def fetch(self, media_root, mode, url, **headers):
+        with override_settings(MEDIA_ROOT=media_root, MEDIA_SERVING={"MODE": mode}):
+            response = Client(HTTP_HOST="localhost").get(url, **headers)
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+            response.close()
+        response.body_size = len(body)
+        return response
+
+    def report(self, label, media_root, mode, url, count, **headers):
+        self.fetch(media_root, mode, url, **headers)  # warm up
+
+        transferred = 0
+        start = time.perf_counter()
+        for _ in range(count):
+            transferred += self.fetch(media_root, mode, url, **headers).body_size
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{label:<28}{count / elapsed:>10.0f}{transferred / elapsed / 1e6:>10.1f}{elapsed / count * 1000:>10.2f}"
+        )
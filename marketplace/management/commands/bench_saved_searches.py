@@ -0,0 +1,98 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import best_of, rolled_back, seed_campus
+from marketplace.matching import SearchIndex, tokenize
+from marketplace.models import Category, SavedSearch
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark: matching new listings against saved searches with the "
+        "inverted index vs checking every search. Seeds data inside a "
+        "transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--searches", type=int, default=100_000, help="saved searches (default 100000)")
+        parser.add_argument("--listings", type=int, default=200, help="new listings to match (default 200)")
+        parser.add_argument("--vocabulary", type=int, default=5000, help="distinct keywords (default 5000)")
+        parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (default 3)")
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+
+    def run(self, options):
+        rng = random.Random(42)
+        words = [f"word{i}" for i in range(options["vocabulary"])]
+        weights = [(rank + 1) ** -0.7 for rank in range(len(words))]  # mildly skewed, like real titles
+
+        institute = seed_campus(0, 0, code="BENCH-SEARCH")
+        user = institute.members.first().user
+        categories = [Category.objects.create(institute=institute, name=f"Category {i}") for i in range(20)]
+
+        started = time.perf_counter()
+        searches = []
+        for _ in range(options["searches"]):
+            low = rng.choice([None, None, rng.randrange(0, 5000)])
+            # 1% "anything new in <category>", the rest 1-3 keywords
+            keywordless = rng.random() < 0.01
+            searches.append(SavedSearch(
+                institute=institute, user=user,
+                keywords="" if keywordless else " ".join(rng.choices(words, weights, k=rng.randint(1, 3))),
+                category=rng.choice(categories) if keywordless or rng.random() < 0.3 else None,
+                min_price=low,
+                max_price=None if low is None else low + rng.randrange(500, 20000),
+            ))
+        SavedSearch.objects.bulk_create(searches, batch_size=5000)
+        self.stdout.write(f"seeded {len(searches)} saved searches in {time.perf_counter() - started:.1f}s")
+
+        listings = [
+            (
+                " ".join(rng.choices(words, weights, k=rng.randint(2, 5))),
+                " ".join(rng.choices(words, weights, k=rng.randint(5, 20))),
+                rng.choice(categories).id if rng.random() < 0.7 else None,
+                rng.randrange(50, 30000),
+            )
+            for _ in range(options["listings"])
+        ]
+
+        build_ms = best_of(lambda: self.build(institute), 1)
+        index = self.build(institute)
+        rows = [(pk, *entry) for pk, entry in index.searches.items()]  # (pk, user, terms, category, low, high)
+
+        def brute_force():
+            results = []
+            for title, description, category_id, price in listings:
+                tokens = tokenize(f"{title} {description}")
+                results.append(sorted(
+                    pk for pk, _, terms, wanted, low, high in rows
+                    if terms <= tokens and (wanted is None or wanted == category_id)
+                    and (low is None or price >= low) and (high is None or price <= high)
+                ))
+            return results
+
+        def indexed():
+            return [sorted(index.match(*listing)) for listing in listings]
+
+        expected = brute_force()
+        if indexed() != expected:
+            raise CommandError("index results differ from brute force")
+
+        brute_ms = best_of(brute_force, options["repeat"]) / len(listings)
+        index_ms = best_of(indexed, options["repeat"]) / len(listings)
+        matches = sum(map(len, expected)) / len(listings)
+
+        self.stdout.write(f"index build from DB   {build_ms:>10.1f} ms")
+        self.stdout.write(f"brute force           {brute_ms:>10.3f} ms / listing")
+        self.stdout.write(f"inverted index        {index_ms:>10.3f} ms / listing ({brute_ms / index_ms:.0f}x)")
+        self.stdout.write(f"matches               {matches:>10.1f} / listing")
+
+    def build(self, institute):
+        rows = SavedSearch.objects.filter(institute=institute).order_by().values_list(
+            "id", "user_id", "keywords", "category_id", "min_price", "max_price",
+        )
+        return SearchIndex(rows.iterator(chunk_size=5000))
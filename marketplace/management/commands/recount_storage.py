@@ -0,0 +1,98 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from marketplace.models import (
+    ArchivedListingImage,
+    InstituteStorageUsage,
+    ListingImage,
+    UserStorageUsage,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the upload storage totals (UserStorageUsage / "
+        "InstituteStorageUsage) from the image rows on every database alias. "
+        "Images without a recorded size (uploaded before sizes were kept) get "
+        "it from the file first. Run it in a quiet window: uploads made while "
+        "the totals are rewritten are not counted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="images per size lookup (default 1000)")
+        parser.add_argument("--dry-run", action="store_true", help="only report the totals that would change")
+
+    def handle(self, *args, **options):
+        for alias in settings.DATABASES:
+            started = time.perf_counter()
+            sized = 0
+            if not options["dry_run"]:
+                sized = sum(self.fill_sizes(model, alias, options["batch_size"]) for model in (ListingImage, ArchivedListingImage))
+
+            per_user = {}
+            for model in (ListingImage, ArchivedListingImage):
+                rows = (
+                    model.objects.using(alias)
+                    .values(institute_id=F("listing__institute_id"), user_id=F("listing__owner_id"))
+                    .annotate(bytes=Sum("size"), files=Count("id"))
+                    .order_by()
+                )
+                for row in rows:
+                    totals = per_user.setdefault((row["institute_id"], row["user_id"]), [0, 0])
+                    totals[0] += row["bytes"] or 0
+                    totals[1] += row["files"]
+
+            per_institute = {}
+            for (institute_id, _), (size, files) in per_user.items():
+                totals = per_institute.setdefault(institute_id, [0, 0])
+                totals[0] += size
+                totals[1] += files
+
+            current = {
+                (row.institute_id, row.user_id): [row.bytes, row.files]
+                for row in UserStorageUsage.objects.using(alias)
+            }
+            drift = sum(1 for key in per_user.keys() | current.keys() if per_user.get(key) != current.get(key))
+            if options["dry_run"]:
+                self.stdout.write(f"{alias}: {drift} of {len(per_user)} user totals would change")
+                continue
+
+            with transaction.atomic(using=alias):
+                UserStorageUsage.objects.using(alias).all().delete()
+                InstituteStorageUsage.objects.using(alias).all().delete()
+                UserStorageUsage.objects.using(alias).bulk_create([
+                    UserStorageUsage(institute_id=institute_id, user_id=user_id, bytes=size, files=files)
+                    for (institute_id, user_id), (size, files) in per_user.items()
+                ], batch_size=1000)
+                InstituteStorageUsage.objects.using(alias).bulk_create([
+                    InstituteStorageUsage(institute_id=institute_id, bytes=size, files=files)
+                    for institute_id, (size, files) in per_institute.items()
+                ], batch_size=1000)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{alias}: {len(per_user)} user / {len(per_institute)} institute totals rebuilt "
+                f"({drift} changed, {sized} image sizes filled in) in {time.perf_counter() - started:.1f}s"
+            ))
+
+    def fill_sizes(self, model, alias, batch_size):
+        storage = model._meta.get_field("image").storage
+        queryset = model.objects.using(alias).filter(size=0).order_by("pk")
+        filled, last = 0, None
+        while True:
+            batch = queryset if last is None else queryset.filter(pk__gt=last)
+            batch = list(batch.values_list("pk", "image")[:batch_size])
+            if not batch:
+                return filled
+            last = batch[-1][0]
+            for pk, name in batch:
+                try:
+                    size = storage.size(name)
+                except OSError:
+                    continue  # file already gone; counts as 0
+                if size:
+                    model.objects.using(alias).filter(pk=pk).update(size=size)
+                    filled += 1
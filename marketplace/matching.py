@@ -0,0 +1,159 @@
+"""
+Matching new listings against saved searches.
+
+Each institute's saved searches are loaded into a `SearchIndex`, an inverted
+index keyed by one term per search. The anchor is the search's longest
+keyword, since longer words tend to be rarer. A new listing only looks at the
+searches anchored on one of its own tokens, and checks those candidates
+(all keywords present, category, price range). Searches without keywords
+are bucketed by category instead.
+
+Indexes are kept per process and rebuilt when the institute's version
+number in the cache moves; signals bump it on every SavedSearch change.
+The bump only reaches other processes (the task worker among them) through
+a shared cache, so an index is also rebuilt once it is older than
+SAVED_SEARCHES["MAX_STALENESS"] seconds.
+
+Matching runs in the task queue (marketplace/jobs.py, queued when the
+listing is created) and ends in one bulk insert of notifications.
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from accounts.models import Institute
+from core.metrics import counter, histogram
+from core.sharding import use_tenant
+from notifications.utils import create_notifications
+
+from .models import Listing, SavedSearch
+
+
+SEARCH_MATCHES = counter("saved_search_matches_total", "Saved searches matched by new listings.")
+MATCH_LATENCY = histogram("saved_search_match_seconds", "Time to match one new listing.")
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+class SearchIndex:
+    def __init__(self, searches):
+        """`searches`: (id, user_id, keywords, category_id, min_price, max_price) tuples."""
+        self.searches = {}
+        self.by_term = defaultdict(list)
+        self.by_category = defaultdict(list)  # keyword-less searches, None = any category
+
+        for pk, user_id, keywords, category_id, min_price, max_price in searches:
+            terms = frozenset(tokenize(keywords))
+            self.searches[pk] = (user_id, terms, category_id, min_price, max_price)
+            if terms:
+                self.by_term[max(terms, key=len)].append(pk)
+            else:
+                self.by_category[category_id].append(pk)
+
+    def __len__(self):
+        return len(self.searches)
+
+    def match(self, title, description, category_id, price):
+        """Ids of the saved searches a listing with these fields satisfies."""
+        tokens = tokenize(f"{title} {description}")
+
+        candidates = [pk for token in tokens for pk in self.by_term.get(token, ())]
+        candidates += self.by_category.get(None, ())
+        if category_id is not None:
+            candidates += self.by_category.get(category_id, ())
+
+        matched = []
+        for pk in candidates:
+            _, terms, wanted_category, min_price, max_price = self.searches[pk]
+            if (
+                terms <= tokens
+                and (wanted_category is None or wanted_category == category_id)
+                and (min_price is None or price >= min_price)
+                and (max_price is None or price <= max_price)
+            ):
+                matched.append(pk)
+        return matched
+
+    def users(self, search_ids):
+        return {self.searches[pk][0] for pk in search_ids}
+
+
+# =========================
+# PER-INSTITUTE INDEX CACHE
+# =========================
+_indexes = {}  # institute id -> (version, built at, SearchIndex)
+_lock = threading.Lock()
+
+
+def _version_key(institute_id):
+    return f"saved-search:{institute_id}:version"
+
+
+def index_version(institute_id):
+    key = _version_key(institute_id)
+    version = cache.get(key)
+    if version is None:
+        version = int(time.time() * 1000)
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def invalidate_index(institute_id):
+    try:
+        cache.incr(_version_key(institute_id))
+    except ValueError:
+        index_version(institute_id)
+
+
+def get_index(institute_id):
+    version = index_version(institute_id)
+    now = time.monotonic()
+    max_staleness = getattr(settings, "SAVED_SEARCHES", {}).get("MAX_STALENESS", 30)
+    cached = _indexes.get(institute_id)
+    if cached is not None and cached[0] == version and now - cached[1] < max_staleness:
+        return cached[2]
+
+    rows = SavedSearch.objects.filter(institute_id=institute_id).order_by().values_list(
+        "id", "user_id", "keywords", "category_id", "min_price", "max_price",
+    )
+    index = SearchIndex(rows.iterator(chunk_size=5000))
+    with _lock:
+        _indexes[institute_id] = (version, now, index)
+    return index
+
+
+# =========================
+# DELIVERY
+# =========================
+def notify_matches(listing_id, institute_id):
+    institute = Institute.objects.get(pk=institute_id)
+    with use_tenant(institute):
+        listing = Listing.objects.filter(pk=listing_id).values(
+            "title", "description", "category_id", "price", "owner_id",
+        ).first()
+        if listing is None:
+            return 0
+
+        start = time.perf_counter()
+        index = get_index(institute_id)
+        matched = index.match(listing["title"], listing["description"], listing["category_id"], listing["price"])
+        users = index.users(matched) - {listing["owner_id"]}
+        MATCH_LATENCY.observe(time.perf_counter() - start)
+        SEARCH_MATCHES.inc(amount=len(matched))
+
+        create_notifications(
+            institute=institute,
+            user_ids=users,
+            title="New listing matches your saved search",
+            message=f"'{listing['title']}' was just listed for ₹{listing['price']}.",
+        )
+        return len(users)
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_institute_db_alias'),
+        ('marketplace', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='popularity',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['institute', '-popularity'], name='listing_inst_popularity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['institute', '-view_count'], name='listing_inst_views_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0005_archived_listings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedlistingimage',
+            index=models.Index(fields=['image'], name='archived_image_path_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingimage',
+            index=models.Index(fields=['image'], name='listing_image_path_idx'),
+        ),
+    ]
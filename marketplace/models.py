@@ -31,8 +31,21 @@ class Listing(models.Model):
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="AVAILABLE")
 
+    sold_at = models.DateTimeField(null=True, blank=True)  # set when an order completes
+
+    # 📈 written in batches by marketplace/popularity.py, never per request
+    view_count = models.PositiveIntegerField(default=0)
+    popularity = models.FloatField(default=0.0)  # log of forward-decayed views
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["institute", "-popularity"], name="listing_inst_popularity_idx"),
+            models.Index(fields=["institute", "-view_count"], name="listing_inst_views_idx"),
+            models.Index(fields=["title"], name="listing_title_idx"),  # admin ^title search
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.institute.code}"
 
@@ -40,7 +53,115 @@ class Listing(models.Model):
 class ListingImage(models.Model):
     listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="listings/")
+    size = models.PositiveBigIntegerField(default=0)  # bytes, counted in StorageUsage
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["image"], name="listing_image_path_idx"),  # gc_media lookups
+        ]
+
     def __str__(self):
         return f"Image for Listing #{self.listing.id}"
+
+
+# =========================
+# ARCHIVE (sold listings, moved out by the archive_listings command)
+# =========================
+# Same columns and ids as Listing / ListingImage, so order history and the
+# listing serializers read an archived row exactly like a live one.
+
+class ArchivedListing(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="archived_listings")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_listings")
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="archived_listings")
+
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    price = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=Listing.STATUS_CHOICES)
+    view_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField()
+    sold_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.title} - {self.institute.code} (archived)"
+
+
+class ArchivedListingImage(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    listing = models.ForeignKey(ArchivedListing, on_delete=models.CASCADE, related_name="images")
+    image = models.ImageField(upload_to="listings/")
+    size = models.PositiveBigIntegerField(default=0)  # the file stays on disk, so it still counts
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["image"], name="archived_image_path_idx"),  # gc_media lookups
+        ]
+
+    def __str__(self):
+        return f"Image for archived Listing #{self.listing_id}"
+
+
+# =========================
+# STORAGE USAGE (upload quotas, marketplace/quotas.py)
+# =========================
+# Kept incrementally as images are uploaded and deleted; `recount_storage`
+# rebuilds them from the image rows.
+
+class StorageUsage(models.Model):
+    bytes = models.BigIntegerField(default=0)
+    files = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class UserStorageUsage(StorageUsage):
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="user_storage_usage")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="storage_usage")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["institute", "user"], name="user_storage_usage_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.bytes} bytes ({self.institute.code})"
+
+
+class InstituteStorageUsage(StorageUsage):
+    institute = models.OneToOneField(Institute, on_delete=models.CASCADE, related_name="storage_usage")
+
+    def __str__(self):
+        return f"{self.institute.code}: {self.bytes} bytes"
+
+
+class SavedSearch(models.Model):
+    """
+    "Tell me when a listing like this shows up". Every keyword must appear in
+    the new listing's title or description; category and price bounds are
+    optional. Matched by marketplace/matching.py when a listing is created.
+    """
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="saved_searches")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_searches")
+
+    name = models.CharField(max_length=100, blank=True)
+    keywords = models.CharField(max_length=200, blank=True)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True, related_name="saved_searches")
+    min_price = models.PositiveIntegerField(null=True, blank=True)
+    max_price = models.PositiveIntegerField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.keywords or self.name} ({self.institute.code})"
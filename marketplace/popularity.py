@@ -0,0 +1,117 @@
+"""
+Listing view counts and the "trending" score.
+
+Retrieves call `record_view()`, which only bumps a counter in this process's
+buffer. Every FLUSH_INTERVAL seconds (or once MAX_PENDING views are
+waiting) the request that notices writes the buffer out: listings are
+grouped by how many views they got, so each distinct count is a single
+`UPDATE ... WHERE id IN (...)` no matter how many listings it covers.
+
+`popularity` uses forward decay: a view at time t is worth
+2 ** ((t - EPOCH) / HALF_LIFE), so newer views outweigh older ones without
+ever rewriting old rows. The column stores the log of that sum, which
+keeps it a plain indexed float that can be ordered on directly.
+"""
+import atexit
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+
+from core.metrics import counter
+
+from .models import Listing
+
+
+logger = logging.getLogger(__name__)
+
+VIEWS_FLUSHED = counter("listing_views_flushed_total", "Listing views written to the database.")
+FLUSH_QUERIES = counter("listing_view_flush_updates_total", "UPDATE statements issued by view flushes.")
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+
+_DEFAULTS = {
+    "HALF_LIFE_HOURS": 72,
+    "FLUSH_INTERVAL": 10,
+    "MAX_PENDING": 1000,
+}
+
+
+def _config(name):
+    return getattr(settings, "LISTING_POPULARITY", {}).get(name, _DEFAULTS[name])
+
+
+def decay_term(views, now=None):
+    """log(views * 2 ** ((now - EPOCH) / half_life))"""
+    now = time.time() if now is None else now
+    half_life = _config("HALF_LIFE_HOURS") * 3600
+    return math.log(views) + (now - EPOCH) / half_life * math.log(2)
+
+
+def _log_add(column, term):
+    # log(exp(a) + exp(b)) without overflowing: max(a, b) + log(1 + exp(-|a - b|))
+    term = Value(term, output_field=FloatField())
+    return Greatest(F(column), term) + Ln(Value(1.0) + Exp(-Abs(F(column) - term)))
+
+
+class ViewBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)  # (db alias, listing id) -> views
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, alias, listing_id):
+        with self._lock:
+            self._pending[alias, listing_id] += 1
+            self._size += 1
+            due = (
+                self._size >= _config("MAX_PENDING")
+                or time.monotonic() - self._last_flush >= _config("FLUSH_INTERVAL")
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._size = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        groups = defaultdict(list)  # (alias, views) -> listing ids
+        for (alias, listing_id), views in pending.items():
+            groups[alias, views].append(listing_id)
+
+        now = time.time()
+        written = 0
+        for (alias, views), ids in groups.items():
+            try:
+                Listing.objects.using(alias).filter(pk__in=ids).update(
+                    view_count=F("view_count") + views,
+                    popularity=_log_add("popularity", decay_term(views, now)),
+                )
+            except Exception:
+                # views are best-effort; losing one batch beats failing the request
+                logger.exception("Dropped %d listing views on %s", views * len(ids), alias)
+                continue
+            FLUSH_QUERIES.inc()
+            written += views * len(ids)
+
+        VIEWS_FLUSHED.inc(amount=written)
+        return written
+
+
+buffer = ViewBuffer()
+atexit.register(buffer.flush)
+
+
+def record_view(listing):
+    buffer.add(listing._state.db, listing.pk)
@@ -0,0 +1,146 @@
+"""
+Upload storage accounting and quotas.
+
+Every image row carries its file size. UserStorageUsage (per listing
+owner) and InstituteStorageUsage hold running totals: charged in the
+transaction that saves an upload, released by a post_delete signal when an
+image row goes. Archived images keep counting, their files are still on
+disk. `manage.py recount_storage` rebuilds the totals from the rows.
+
+settings.UPLOAD_LIMITS (bytes, None = unlimited) is enforced twice:
+
+- while the body streams in, QuotaUploadHandler refuses a Content-Length
+  that cannot fit and stops reading as soon as a file grows past
+  MAX_FILE_SIZE or the room left in either quota;
+- when the image is saved, a conditional UPDATE charges each total only if
+  it stays under quota, so concurrent uploads cannot overshoot together.
+"""
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import router
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import InstituteStorageUsage, UserStorageUsage
+
+
+# multipart boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD = 16 * 1024
+
+_DEFAULTS = {
+    "MAX_FILE_SIZE": 5 * 1024 ** 2,
+    "USER_QUOTA": 100 * 1024 ** 2,
+    "INSTITUTE_QUOTA": 10 * 1024 ** 3,
+}
+
+
+def _config(name):
+    return getattr(settings, "UPLOAD_LIMITS", {}).get(name, _DEFAULTS[name])
+
+
+def _human(size):
+    if size >= 1024 ** 2:
+        return f"{size / 1024 ** 2:.1f} MiB"
+    return f"{size / 1024:.0f} KiB"
+
+
+class StorageLimitExceeded(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Not enough storage left for this upload."
+    default_code = "storage_limit"
+
+
+def usage(institute, user):
+    """Totals and limits for `user` and their institute, from the counters only."""
+    alias = router.db_for_read(UserStorageUsage, instance=institute)
+    empty = {"bytes": 0, "files": 0}
+    mine = UserStorageUsage.objects.using(alias).filter(institute=institute, user=user).values("bytes", "files").first()
+    total = InstituteStorageUsage.objects.using(alias).filter(institute=institute).values("bytes", "files").first()
+    return {
+        "user": {**(mine or empty), "quota": _config("USER_QUOTA")},
+        "institute": {**(total or empty), "quota": _config("INSTITUTE_QUOTA")},
+        "max_file_size": _config("MAX_FILE_SIZE"),
+    }
+
+
+def room_left(institute, user):
+    """Bytes `user` may still upload (None = no quota applies)."""
+    data = usage(institute, user)
+    left = [scope["quota"] - scope["bytes"] for scope in (data["user"], data["institute"]) if scope["quota"] is not None]
+    return max(min(left), 0) if left else None
+
+
+class QuotaUploadHandler(FileUploadHandler):
+    """
+    First in request.upload_handlers: passes chunks on to the next handler
+    and aborts the parse with StorageLimitExceeded once a limit is crossed.
+    """
+
+    def __init__(self, request=None, room=None):
+        super().__init__(request)
+        self.max_file_size = _config("MAX_FILE_SIZE")
+        self.room = room
+        self.file_bytes = self.total_bytes = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if self.max_file_size is not None and content_length > self.max_file_size + MULTIPART_OVERHEAD:
+            raise self._too_large()
+        if self.room is not None and content_length > self.room + MULTIPART_OVERHEAD:
+            raise self._no_room()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file_bytes = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.file_bytes += len(raw_data)
+        self.total_bytes += len(raw_data)
+        if self.max_file_size is not None and self.file_bytes > self.max_file_size:
+            raise self._too_large()
+        if self.room is not None and self.total_bytes > self.room:
+            raise self._no_room()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+    def _too_large(self):
+        return StorageLimitExceeded(f"Files can be at most {_human(self.max_file_size)}.")
+
+    def _no_room(self):
+        return StorageLimitExceeded(f"Not enough storage left: {_human(self.room)} remaining.")
+
+
+def limit_upload(request, institute, user):
+    """Check the upload against the limits as it is read; call before touching request.data."""
+    request.upload_handlers.insert(0, QuotaUploadHandler(request, room_left(institute, user)))
+
+
+def charge(institute, user, size, using):
+    """
+    Add one file of `size` bytes to the user's and the institute's totals,
+    or raise StorageLimitExceeded. Call inside the transaction that saves it.
+    """
+    now = timezone.now()
+    scopes = [
+        (UserStorageUsage, {"institute": institute, "user": user}, _config("USER_QUOTA")),
+        (InstituteStorageUsage, {"institute": institute}, _config("INSTITUTE_QUOTA")),
+    ]
+    for model, lookup, quota in scopes:
+        rows = model.objects.using(using)
+        rows.get_or_create(**lookup)
+
+        matched = rows.filter(**lookup)
+        if quota is not None:
+            matched = matched.filter(bytes__lte=quota - size)
+        if not matched.update(bytes=F("bytes") + size, files=F("files") + 1, updated_at=now):
+            raise StorageLimitExceeded()
+
+
+def release(institute_id, user_id, size, using):
+    """Take one deleted file off the totals."""
+    changes = {"bytes": F("bytes") - size, "files": F("files") - 1, "updated_at": timezone.now()}
+    UserStorageUsage.objects.using(using).filter(institute_id=institute_id, user_id=user_id).update(**changes)
+    InstituteStorageUsage.objects.using(using).filter(institute_id=institute_id).update(**changes)
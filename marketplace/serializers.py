@@ -1,27 +1,32 @@
+from collections import defaultdict
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Category, Listing, ListingImage
+from core.mixins import SparseFieldsSerializerMixin
+from .models import Category, Listing, ListingImage, SavedSearch
 
 
-class UserMiniSerializer(serializers.ModelSerializer):
+class UserMiniSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email"]
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name"]
 
 
-class ListingImageSerializer(serializers.ModelSerializer):
+class ListingImageSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ListingImage
         fields = ["id", "image", "created_at"]
 
 
-class ListingSerializer(serializers.ModelSerializer):
+class ListingSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ["owner", "category", "images"]
+
     owner = UserMiniSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False)
@@ -35,14 +40,112 @@ class ListingSerializer(serializers.ModelSerializer):
             "description",
             "price",
             "status",
+            "view_count",
             "category",
             "category_id",
             "owner",
             "images",
             "created_at",
         ]
+        read_only_fields = ["view_count"]
 
     def validate_price(self, value):
         if value <= 0:
             raise serializers.ValidationError("Price must be greater than 0")
         return value
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    category = CategorySerializer(read_only=True)
+    category_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
+
+    class Meta:
+        model = SavedSearch
+        fields = ["id", "name", "keywords", "category", "category_id", "min_price", "max_price", "created_at"]
+
+    def validate(self, data):
+        min_price = data.get("min_price", getattr(self.instance, "min_price", None))
+        max_price = data.get("max_price", getattr(self.instance, "max_price", None))
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError({"max_price": "Must be at least min_price"})
+
+        keywords = data.get("keywords", getattr(self.instance, "keywords", ""))
+        category_id = data.get("category_id", getattr(self.instance, "category_id", None))
+        if not keywords.strip() and category_id is None and min_price is None and max_price is None:
+            raise serializers.ValidationError("Give at least keywords, a category or a price range")
+        return data
+
+
+# =========================
+# FAST READ PATH (list actions)
+# =========================
+# Builds exactly what ListingSerializer returns, straight from .values()
+# rows plus one image query, without model instances or per-row field
+# objects. Keep in sync with the serializers above; the
+# bench_list_serializers command checks the JSON stays byte-identical.
+_datetime = serializers.DateTimeField()
+_image_storage = ListingImage._meta.get_field("image").storage
+
+
+def listing_values(prefix=""):
+    return tuple(prefix + name for name in (
+        "id", "title", "description", "price", "status", "view_count",
+        "category_id", "category__name",
+        "owner_id", "owner__username", "owner__email",
+        "created_at",
+    ))
+
+
+def format_datetime(value):
+    return _datetime.to_representation(value) if value is not None else None
+
+
+def image_url(name, request=None):
+    # mirrors serializers.ImageField: absolute URL when a request is in context
+    if not name:
+        return None
+    url = _image_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def images_by_listing(listing_ids, request=None, model=ListingImage):
+    images = defaultdict(list)
+    rows = model.objects.filter(listing_id__in=listing_ids).values_list(
+        "listing_id", "id", "image", "created_at"
+    )
+    for listing_id, pk, name, created_at in rows:
+        images[listing_id].append({
+            "id": pk,
+            "image": image_url(name, request),
+            "created_at": format_datetime(created_at),
+        })
+    return images
+
+
+def listing_row_data(row, images, prefix=""):
+    category_id = row[prefix + "category_id"]
+    return {
+        "id": row[prefix + "id"],
+        "title": row[prefix + "title"],
+        "description": row[prefix + "description"],
+        "price": row[prefix + "price"],
+        "status": row[prefix + "status"],
+        "view_count": row[prefix + "view_count"],
+        "category": None if category_id is None else {
+            "id": category_id,
+            "name": row[prefix + "category__name"],
+        },
+        "owner": {
+            "id": row[prefix + "owner_id"],
+            "username": row[prefix + "owner__username"],
+            "email": row[prefix + "owner__email"],
+        },
+        "images": images.get(row[prefix + "id"], []),
+        "created_at": format_datetime(row[prefix + "created_at"]),
+    }
+
+
+def serialize_listing_rows(rows, request=None):
+    """Fast equivalent of ListingSerializer(listings, many=True).data for listing_values() rows."""
+    images = images_by_listing([row["id"] for row in rows], request)
+    return [listing_row_data(row, images) for row in rows]
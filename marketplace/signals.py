@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .feed_cache import invalidate_feed
+from .matching import invalidate_index
+from .models import Category, Listing, ListingImage, SavedSearch
+from .quotas import release
+
+
+def _invalidate_on_commit(institute_id, using):
+    # `using` is the shard the row was written to, so a write inside an
+    # atomic block there invalidates after that block commits
+    transaction.on_commit(lambda: invalidate_feed(institute_id), using=using)
+
+
+@receiver([post_save, post_delete], sender=Listing)
+def listing_changed(sender, instance, using, **kwargs):
+    _invalidate_on_commit(instance.institute_id, using)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def category_changed(sender, instance, using, **kwargs):
+    _invalidate_on_commit(instance.institute_id, using)
+
+
+@receiver([post_save, post_delete], sender=ListingImage)
+def listing_image_changed(sender, instance, using, **kwargs):
+    try:
+        institute_id = instance.listing.institute_id
+    except Listing.DoesNotExist:
+        # the listing is being deleted too; its own signal invalidates
+        return
+    _invalidate_on_commit(institute_id, using)
+
+
+@receiver(post_delete, sender=ListingImage)
+def listing_image_deleted(sender, instance, using, **kwargs):
+    listing = Listing.objects.using(using).filter(pk=instance.listing_id).values_list("institute_id", "owner_id").first()
+    if listing is not None:
+        release(*listing, instance.size, using=using)
+
+
+@receiver([post_save, post_delete], sender=SavedSearch)
+def saved_search_changed(sender, instance, using, **kwargs):
+    institute_id = instance.institute_id
+    transaction.on_commit(lambda: invalidate_index(institute_id), using=using)
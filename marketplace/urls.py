@@ -1,10 +1,11 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import CategoryViewSet, ListingViewSet
+from .views import CategoryViewSet, ListingViewSet, SavedSearchViewSet
 
 router = DefaultRouter()
 router.register("categories", CategoryViewSet, basename="categories")
 router.register("listings", ListingViewSet, basename="listings")
+router.register("saved-searches", SavedSearchViewSet, basename="saved-searches")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,14 +1,33 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.conf import settings
+from django.db import router, transaction
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 
 
 
-from .models import Category, Listing, ListingImage
-from .serializers import CategorySerializer, ListingSerializer, ListingImageSerializer
+from .models import Category, Listing, ListingImage, SavedSearch
+from .serializers import (
+    CategorySerializer,
+    ListingSerializer,
+    ListingImageSerializer,
+    SavedSearchSerializer,
+    listing_values,
+    serialize_listing_rows,
+)
 from .permissions import IsOwnerOrReadOnly
+from core.throttling import UserTokenBucketThrottle, InstituteTokenBucketThrottle
+from core.mixins import SparseFieldsViewMixin, sparse_params
+from sync.views import ChangesMixin
+from .filters import ListingFilter
+from .facets import cached_facets
+from . import feed_cache, quotas
+from .popularity import record_view
+from .jobs import match_saved_searches
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -24,20 +43,70 @@ class CategoryViewSet(viewsets.ModelViewSet):
         serializer.save(institute=institute)
 
 
-class ListingViewSet(viewsets.ModelViewSet):
+class ListingViewSet(ChangesMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = ListingSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
+    sync_kind = "listings"
+
+    # ✂️ ?fields= / ?expand= only load the relations they render
+    sparse_select_related = {"owner": ["owner"], "category": ["category"]}
+    sparse_prefetch_related = {"images": ["images"]}
 
     # ✅ Search + Filter + Ordering
     search_fields = ["title", "description"]
-    ordering_fields = ["price", "created_at", "title"]
+    ordering_fields = ["price", "created_at", "title", "view_count", "popularity"]
     ordering = ["-created_at"]
-    filterset_fields = ["status", "price"]
+    filterset_class = ListingFilter
+
+    throttle_scope = "upload"
+
+    # 🚦 per-user + per-institute budgets on image uploads only
+    def get_throttles(self):
+        if self.action == "upload_image":
+            return [UserTokenBucketThrottle(), InstituteTokenBucketThrottle()]
+        return super().get_throttles()
 
     def get_queryset(self):
         institute = self.request.user.profile.institute
         return Listing.objects.filter(institute=institute).select_related("owner", "category").prefetch_related("images")
 
+    # 🗃️ default feed pages are served from the per-institute cache
+    def list(self, request, *args, **kwargs):
+        if sparse_params(request) is not None:
+            return super().list(request, *args, **kwargs)
+
+        key = feed_cache.cache_key(request) if request.user.is_authenticated else None
+        if key is None:
+            return self.build_list(request)
+
+        data = feed_cache.get_or_build(key, lambda: self.build_list(request).data)
+        return Response(data)
+
+    # ⚡ list reads rows with .values() and skips ModelSerializer machinery
+    def build_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        rows = queryset.values(*listing_values())
+
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(serialize_listing_rows(list(rows), request))
+        return self.get_paginated_response(serialize_listing_rows(page, request))
+
+    # 📈 views are buffered in memory and written in batches
+    def retrieve(self, request, *args, **kwargs):
+        listing = self.get_object()
+        if listing.owner_id != request.user.id:
+            record_view(listing)
+        return Response(self.get_serializer(listing).data)
+
+    # 📊 counts per category / status / price bucket for the current filters
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["GET"])
+    def facets(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        facets = cached_facets(queryset, request.user.profile.institute, request.query_params)
+        return Response(facets, status=status.HTTP_200_OK)
+
     def perform_create(self, serializer):
         institute = self.request.user.profile.institute
         category_id = self.request.data.get("category_id")
@@ -46,7 +115,10 @@ class ListingViewSet(viewsets.ModelViewSet):
         if category_id:
             category = Category.objects.filter(id=category_id, institute=institute).first()
 
-        serializer.save(owner=self.request.user, institute=institute, category=category)
+        listing = serializer.save(owner=self.request.user, institute=institute, category=category)
+
+        # 🔔 saved searches are matched by the task queue, off the request
+        match_saved_searches.enqueue(institute, listing_id=listing.pk)
 
     @extend_schema(
     request=ListingImageSerializer,
@@ -64,9 +136,52 @@ class ListingViewSet(viewsets.ModelViewSet):
         if listing.owner != request.user:
             return Response({"error": "Only owner can upload images"}, status=status.HTTP_403_FORBIDDEN)
 
+        # 🗄️ size / quota limits are checked while the body is read
+        quotas.limit_upload(request, listing.institute, request.user)
+
         serializer = ListingImageSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(listing=listing)
+            size = serializer.validated_data["image"].size
+            alias = router.db_for_write(ListingImage, instance=listing)
+            with transaction.atomic(using=alias):
+                quotas.charge(listing.institute, request.user, size, using=alias)
+                serializer.save(listing=listing, size=size)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # 🗄️ upload storage used / allowed, from the running totals
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["GET"], permission_classes=[permissions.IsAuthenticated])
+    def storage(self, request):
+        return Response(quotas.usage(request.user.profile.institute, request.user))
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        institute = self.request.user.profile.institute
+        return SavedSearch.objects.filter(institute=institute, user=self.request.user).select_related("category")
+
+    def _save(self, serializer, **extra):
+        institute = self.request.user.profile.institute
+        if "category_id" in serializer.validated_data:
+            category_id = serializer.validated_data.pop("category_id")
+            category = None
+            if category_id is not None:
+                category = Category.objects.filter(id=category_id, institute=institute).first()
+                if category is None:
+                    raise ValidationError({"category_id": "Category not found in your institute"})
+            extra["category"] = category
+        serializer.save(**extra)
+
+    def perform_create(self, serializer):
+        limit = getattr(settings, "SAVED_SEARCHES", {}).get("MAX_PER_USER", 20)
+        if self.get_queryset().count() >= limit:
+            raise ValidationError({"error": f"You can keep at most {limit} saved searches"})
+        self._save(serializer, user=self.request.user, institute=self.request.user.profile.institute)
+
+    def perform_update(self, serializer):
+        self._save(serializer)
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import LargeTableAdmin
+
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ["id", "user", "institute", "kind", "title", "count", "is_read", "created_at"]
+    list_select_related = ["user", "institute"]
+    list_filter = ["is_read"]
+    search_fields = ["^user__username"]
+    raw_id_fields = ["user"]
+    autocomplete_fields = ["institute"]
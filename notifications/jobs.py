@@ -0,0 +1,17 @@
+from django.contrib.auth.models import User
+
+from tasks.queue import task
+
+from .utils import create_notification
+
+
+# 🔔 someone is usually waiting on these: ahead of bulk work in the queue
+@task(priority=10)
+def send_notification(institute, user_id, title, message, kind="", subject=None, summary=None, summary_args=None):
+    """create_notification() off the request; queue it with `send_notification.enqueue(institute, ...)`."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return  # account deleted meanwhile
+    create_notification(
+        institute, user, title, message, kind=kind, subject=subject, summary=summary, summary_args=summary_args,
+    )
@@ -10,11 +10,20 @@ class Notification(models.Model):
     title = models.CharField(max_length=200)
     message = models.TextField()
 
+    # 🔔 coalescing (notifications/utils.py): repeats of the same kind and
+    # subject within one window bump `count` on a single row
+    kind = models.CharField(max_length=50, blank=True)
+    coalesce_key = models.CharField(max_length=150, null=True, blank=True)
+    count = models.PositiveIntegerField(default=1)
+
     is_read = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True)  # latest occurrence once merged
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "coalesce_key"], name="notification_coalesce_unique"),
+        ]
 
     def __str__(self):
         return f"Notif({self.user.username}) - {self.title}"
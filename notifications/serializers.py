@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.mixins import SparseFieldsSerializerMixin
 from .models import Notification
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = ["id", "title", "message", "is_read", "created_at"]
+        fields = ["id", "kind", "title", "message", "count", "is_read", "created_at"]
@@ -1,3 +1,101 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from accounts.models import Institute
+
+from .models import Notification
+from .utils import create_notification
+
+
+COALESCING = {"WINDOW": 15 * 60, "KINDS": {"order_request": 60 * 60}}
+
+
+def order_request(institute, seller, listing_id=1, title="Cycle"):
+    return create_notification(
+        institute=institute,
+        user=seller,
+        title="New Order Request",
+        message=f"buyer requested to buy your item '{title}'.",
+        kind="order_request",
+        subject=f"listing:{listing_id}",
+        summary="{count} new requests for '{title}'.",
+        summary_args={"title": title},
+    )
+
+
+@override_settings(NOTIFICATION_COALESCING=COALESCING)
+class CoalescingTests(TestCase):
+    def setUp(self):
+        self.institute = Institute.objects.create(name="Test Institute", code="TEST")
+        self.seller = User.objects.create_user("seller")
+
+    def test_braces_in_title(self):
+        for _ in range(2):
+            order_request(self.institute, self.seller, title="Lamp {new} {0} {count}")
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.message, "2 new requests for 'Lamp {new} {0} {count}'.")
+
+    def test_burst_is_one_row(self):
+        for _ in range(5):
+            order_request(self.institute, self.seller)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.count, 5)
+        self.assertEqual(notification.message, "5 new requests for 'Cycle'.")
+
+    def test_rows_written_drop(self):
+        with override_settings(NOTIFICATION_COALESCING={"WINDOW": 0}):
+            for _ in range(20):
+                order_request(self.institute, self.seller, listing_id=1)
+        self.assertEqual(Notification.objects.count(), 20)
+
+        Notification.objects.all().delete()
+        for _ in range(20):
+            order_request(self.institute, self.seller, listing_id=1)
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_subjects_and_users_stay_apart(self):
+        buyer = User.objects.create_user("buyer")
+        order_request(self.institute, self.seller, listing_id=1)
+        order_request(self.institute, self.seller, listing_id=2)
+        order_request(self.institute, buyer, listing_id=1)
+
+        self.assertEqual(Notification.objects.count(), 3)
+        self.assertEqual(set(Notification.objects.values_list("count", flat=True)), {1})
+
+    def test_new_window_starts_a_new_row(self):
+        with mock.patch("notifications.utils.time.time", return_value=3600 * 10):
+            order_request(self.institute, self.seller)
+            order_request(self.institute, self.seller)
+        with mock.patch("notifications.utils.time.time", return_value=3600 * 11):
+            order_request(self.institute, self.seller)
+
+        self.assertEqual(sorted(Notification.objects.values_list("count", flat=True)), [1, 2])
+
+    def test_read_row_counts_again(self):
+        order_request(self.institute, self.seller)
+        order_request(self.institute, self.seller)
+        Notification.objects.update(is_read=True)
+
+        notification = order_request(self.institute, self.seller)
+        self.assertEqual(notification.count, 1)
+        self.assertFalse(notification.is_read)
+        self.assertEqual(notification.message, "buyer requested to buy your item 'Cycle'.")
+
+    def test_lost_insert_race_merges(self):
+        # another request inserted the row between our probe and our INSERT
+        order_request(self.institute, self.seller)
+        probe = mock.patch("django.db.models.query.QuerySet.first", return_value=None)
+        with probe:
+            notification = order_request(self.institute, self.seller)
+
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(notification.count, 2)
+
+    def test_plain_notifications_are_never_merged(self):
+        for _ in range(3):
+            create_notification(self.institute, self.seller, "Order Accepted", "Your request was accepted.")
+        self.assertEqual(Notification.objects.count(), 3)
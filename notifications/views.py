@@ -3,13 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 
+from sync.changes import record
+from sync.views import ChangesMixin
+
 from .models import Notification
 from .serializers import NotificationSerializer
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ChangesMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    sync_kind = "notifications"
 
     def get_queryset(self):
         institute = self.request.user.profile.institute
@@ -25,7 +29,9 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["PATCH"])
     def mark_all_read(self, request):
         qs = self.get_queryset().filter(is_read=False)
-        qs.update(is_read=True)
+        ids = list(qs.values_list("id", flat=True))
+        qs.filter(id__in=ids).update(is_read=True)
+        record("notifications", request.user.profile.institute_id, ids)
         return Response({"message": "All notifications marked as read"}, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=["GET"])
@@ -1,5 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import LargeTableAdmin
+
 from .models import Order
-admin.site.register(Order)
\ No newline at end of file
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ["id", "listing", "institute", "buyer", "seller", "status", "created_at"]
+    list_select_related = ["listing__institute", "archived_listing__institute", "institute", "buyer", "seller"]
+    list_filter = ["status"]
+    search_fields = ["=id", "^buyer__username", "^seller__username"]
+    raw_id_fields = ["listing", "archived_listing", "buyer", "seller"]
+    autocomplete_fields = ["institute"]
@@ -0,0 +1,61 @@
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import parsers, renderers
+from rest_framework.test import APIRequestFactory
+
+from core import parsers as fast_parsers, renderers as fast_renderers
+from core.benchmarks import best_of, rolled_back, seed_campus
+from orders.models import Order
+from orders.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark DRF's stdlib JSON renderer/parser against core.renderers / core.parsers "
+        "on a realistic OrderSerializer page. Seeds data in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="orders on the page (default 100)")
+        parser.add_argument("--images", type=int, default=3, help="images per listing (default 3)")
+        parser.add_argument("--repeat", type=int, default=20, help="timed runs per case (default 20)")
+
+    def handle(self, *args, **options):
+        if fast_renderers.orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed: both sides use stdlib json."))
+
+        with rolled_back():
+            self.run(options)
+
+    def run(self, options):
+        institute = seed_campus(options["rows"], options["images"], code="BENCH-JSON")
+        request = APIRequestFactory().get("/api/orders/", HTTP_HOST="localhost")
+        orders = Order.objects.filter(institute=institute).order_by("-id")
+        payload = {
+            "count": len(orders),
+            "next": None,
+            "previous": None,
+            "results": OrderSerializer(orders, many=True, context={"request": request}).data,
+        }
+
+        stdlib, fast = renderers.JSONRenderer(), fast_renderers.JSONRenderer()
+        body = stdlib.render(payload)
+        if fast.render(payload) != body:
+            raise CommandError("fast renderer output differs from DRF's JSONRenderer")
+
+        stdlib_parser, fast_parser = parsers.JSONParser(), fast_parsers.JSONParser()
+        if fast_parser.parse(io.BytesIO(body)) != stdlib_parser.parse(io.BytesIO(body)):
+            raise CommandError("fast parser result differs from DRF's JSONParser")
+
+        repeat = options["repeat"]
+        cases = [
+            ("render", lambda: stdlib.render(payload), lambda: fast.render(payload)),
+            ("parse", lambda: stdlib_parser.parse(io.BytesIO(body)), lambda: fast_parser.parse(io.BytesIO(body))),
+        ]
+
+        self.stdout.write(f"payload: {options['rows']} orders, {len(body) / 1024:.1f} KiB")
+        self.stdout.write(f"{'':<8}{'stdlib ms':>12}{'fast ms':>12}{'speedup':>10}")
+        for name, slow, quick in cases:
+            slow_ms, fast_ms = best_of(slow, repeat), best_of(quick, repeat)
+            self.stdout.write(f"{name:<8}{slow_ms:>12.3f}{fast_ms:>12.3f}{slow_ms / fast_ms:>9.1f}x")
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0007_storage_usage'),
+        ('orders', '0002_order_archived_listing'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='listing',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='marketplace.listing'),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from accounts.models import Institute
-from marketplace.models import Listing
+from marketplace.models import ArchivedListing, Listing
 
 
 class Order(models.Model):
@@ -15,7 +15,14 @@ class Order(models.Model):
 
     institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="orders")
 
-    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name="orders")
+    # exactly one of these is set: archive_listings moves sold listings out
+    # of the live table and repoints their orders at the archived copy.
+    # Deleting a live listing still deletes its orders; only the archive
+    # command detaches them (and it skips listings with open orders).
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, null=True, related_name="orders")
+    archived_listing = models.ForeignKey(
+        ArchivedListing, on_delete=models.SET_NULL, null=True, blank=True, related_name="orders",
+    )
 
     buyer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders_bought")
     seller = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders_sold")
@@ -27,5 +34,11 @@ class Order(models.Model):
     class Meta:
         ordering = ["-created_at"]
 
+    @property
+    def listing_record(self):
+        """The live listing, or its archived copy once it has been archived."""
+        return self.listing if self.listing_id is not None else self.archived_listing
+
     def __str__(self):
-        return f"Order#{self.id} {self.listing.title} ({self.status})"
+        listing = self.listing_record
+        return f"Order#{self.id} {listing.title if listing else '-'} ({self.status})"
@@ -1,17 +1,26 @@
 from rest_framework import serializers
+from core.mixins import SparseFieldsSerializerMixin
 from .models import Order
-from marketplace.models import Listing
+from marketplace.models import ArchivedListingImage, Listing
 
 
-from marketplace.serializers import ListingSerializer
+from marketplace.serializers import (
+    ListingSerializer,
+    format_datetime,
+    images_by_listing,
+    listing_row_data,
+    listing_values,
+)
+
+class OrderSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = ["listing", "buyer", "seller"]
 
-class OrderSerializer(serializers.ModelSerializer):
     buyer_username = serializers.ReadOnlyField(source="buyer.username")
     seller_username = serializers.ReadOnlyField(source="seller.username")
-    listing_title = serializers.ReadOnlyField(source="listing.title")
+    listing_title = serializers.ReadOnlyField(source="listing_record.title")
     
     # ADD THIS - Full listing with images and price
-    listing = ListingSerializer(read_only=True)
+    listing = ListingSerializer(source="listing_record", read_only=True)
     
     listing_id = serializers.IntegerField(write_only=True)
     
@@ -31,4 +40,44 @@ class OrderSerializer(serializers.ModelSerializer):
         return {'id': obj.buyer.id, 'username': obj.buyer.username}
     
     def get_seller(self, obj):
-        return {'id': obj.seller.id, 'username': obj.seller.username}
\ No newline at end of file
+        return {'id': obj.seller.id, 'username': obj.seller.username}
+
+
+# =========================
+# FAST READ PATH (list actions)
+# =========================
+# Same output as OrderSerializer, built from .values() rows. Orders of
+# archived listings read the archive columns, which have the same names.
+ORDER_VALUES = (
+    "id", "status", "created_at",
+    "buyer_id", "buyer__username",
+    "seller_id", "seller__username",
+) + listing_values("listing__") + listing_values("archived_listing__")
+
+
+def _listing_prefix(row):
+    return "listing__" if row["listing__id"] is not None else "archived_listing__"
+
+
+def serialize_order_rows(rows, request=None):
+    """Fast equivalent of OrderSerializer(orders, many=True).data for ORDER_VALUES rows."""
+    images = images_by_listing([row["listing__id"] for row in rows if row["listing__id"] is not None], request)
+    archived_ids = [row["archived_listing__id"] for row in rows if row["listing__id"] is None]
+    if archived_ids:
+        images.update(images_by_listing(archived_ids, request, model=ArchivedListingImage))
+
+    data = []
+    for row in rows:
+        prefix = _listing_prefix(row)
+        data.append({
+            "id": row["id"],
+            "listing": listing_row_data(row, images, prefix=prefix) if row[prefix + "id"] is not None else None,
+            "listing_title": row[prefix + "title"],
+            "buyer": {"id": row["buyer_id"], "username": row["buyer__username"]},
+            "buyer_username": row["buyer__username"],
+            "seller": {"id": row["seller_id"], "username": row["seller__username"]},
+            "seller_username": row["seller__username"],
+            "status": row["status"],
+            "created_at": format_datetime(row["created_at"]),
+        })
+    return data
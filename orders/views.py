@@ -1,19 +1,62 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from notifications.utils import create_notification
+from notifications.jobs import send_notification
+from core.throttling import UserTokenBucketThrottle, InstituteTokenBucketThrottle
+from core.exports import export_response
+from core.mixins import SparseFieldsViewMixin, sparse_params
+from sync.views import ChangesMixin
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 
 from .models import Order
-from .serializers import OrderSerializer
+from .serializers import OrderSerializer, ORDER_VALUES, serialize_order_rows
 from marketplace.models import Listing
 from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("status", "status"),
+    ("created_at", "created_at"),
+    ("listing_id", "export_listing_id"),
+    ("listing_title", "export_listing_title"),
+    ("price", "export_price"),
+    ("buyer_id", "buyer_id"),
+    ("buyer_username", "buyer__username"),
+    ("seller_id", "seller_id"),
+    ("seller_username", "seller__username"),
+]
+
+
+class OrderViewSet(ChangesMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
-
+    throttle_scope = "orders"
+    sync_kind = "orders"
+
+    # ✂️ ?fields= / ?expand= only load the relations they render; a listing
+    # may live in either table, so both are joined
+    sparse_select_related = {
+        "listing": ["listing", "archived_listing"],
+        "listing_title": ["listing", "archived_listing"],
+        "listing.owner": ["listing__owner", "archived_listing__owner"],
+        "listing.category": ["listing__category", "archived_listing__category"],
+        "buyer": ["buyer"],
+        "buyer_username": ["buyer"],
+        "seller": ["seller"],
+        "seller_username": ["seller"],
+    }
+    sparse_prefetch_related = {"listing.images": ["listing__images", "archived_listing__images"]}
+
+    # 🚦 per-user + per-institute budgets on order creation only
+    def get_throttles(self):
+        if self.action == "create":
+            return [UserTokenBucketThrottle(), InstituteTokenBucketThrottle()]
+        return super().get_throttles()
 
     def get_queryset(self):
         institute = self.request.user.profile.institute
@@ -25,6 +68,36 @@ class OrderViewSet(viewsets.ModelViewSet):
             Q(buyer=user) | Q(seller=user)
         )
 
+    # ⚡ list reads rows with .values() and skips ModelSerializer machinery
+    def list(self, request, *args, **kwargs):
+        if sparse_params(request) is not None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.filter_queryset(self.get_queryset()).values(*ORDER_VALUES)
+
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(serialize_order_rows(list(rows), request))
+        return self.get_paginated_response(serialize_order_rows(page, request))
+
+    # 📤 audit export: same filters as list, streamed as CSV / JSONL
+    @extend_schema(
+        parameters=[OpenApiParameter("export_format", str, enum=["csv", "jsonl"])],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=["GET"])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).annotate(
+            export_listing_id=Coalesce("listing_id", "archived_listing_id"),
+            export_listing_title=Coalesce("listing__title", "archived_listing__title"),
+            export_price=Coalesce("listing__price", "archived_listing__price"),
+        )
+        return export_response(
+            queryset,
+            EXPORT_COLUMNS,
+            filename="orders",
+            export_format=request.query_params.get("export_format", "csv"),
+        )
 
     def create(self, request, *args, **kwargs):
         institute = request.user.profile.institute
@@ -51,11 +124,15 @@ class OrderViewSet(viewsets.ModelViewSet):
             seller=listing.owner,
             status="PENDING"
         )
-        create_notification(
-            institute=order.institute,
-            user=order.seller,
+        send_notification.enqueue(
+            order.institute,
+            user_id=order.seller_id,
             title="New Order Request",
-            message=f"{order.buyer.username} requested to buy your item '{order.listing.title}'."
+            message=f"{order.buyer.username} requested to buy your item '{order.listing.title}'.",
+            kind="order_request",
+            subject=f"listing:{order.listing_id}",
+            summary="{count} new requests for '{title}'.",
+            summary_args={"title": order.listing.title},
         )
 
 
@@ -74,9 +151,9 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         order.status = "ACCEPTED"
         order.save()
-        create_notification(
-        institute=order.institute,
-        user=order.buyer,
+        send_notification.enqueue(
+        order.institute,
+        user_id=order.buyer_id,
         title="Order Accepted",
         message=f"Your request for '{order.listing.title}' was accepted by {order.seller.username}."
         )
@@ -95,9 +172,9 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         order.status = "REJECTED"
         order.save()
-        create_notification(
-        institute=order.institute,
-        user=order.buyer,
+        send_notification.enqueue(
+        order.institute,
+        user_id=order.buyer_id,
         title="Order Rejected",
         message=f"Your request for '{order.listing.title}' was rejected by {order.seller.username}."
         )
@@ -117,9 +194,9 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         order.status = "COMPLETED"
         order.save()
-        create_notification(
-        institute=order.institute,
-        user=order.buyer,
+        send_notification.enqueue(
+        order.institute,
+        user_id=order.buyer_id,
         title="Order Completed",
         message=f"Your order for '{order.listing.title}' is marked completed."      
         )
@@ -127,6 +204,7 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         # mark listing sold
         order.listing.status = "SOLD"
+        order.listing.sold_at = timezone.now()
         order.listing.save()
 
         return Response(OrderSerializer(order).data)
@@ -143,11 +221,15 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         order.status = "CANCELLED"
         order.save()
-        create_notification(
-        institute=order.institute,
-        user=order.seller,
+        send_notification.enqueue(
+        order.institute,
+        user_id=order.seller_id,
         title="Order Cancelled",
-        message=f"The buyer cancelled the order request for '{order.listing.title}'."
+        message=f"The buyer cancelled the order request for '{order.listing.title}'.",
+        kind="order_cancelled",
+        subject=f"listing:{order.listing_id}",
+        summary="{count} order requests for '{title}' were cancelled.",
+        summary_args={"title": order.listing.title},
         )
 
 
@@ -6,7 +6,7 @@ import {
   FiShoppingBag, FiPackage, FiMessageSquare, 
   FiTrendingUp, FiUsers, FiActivity 
 } from 'react-icons/fi';
-import { marketplaceAPI, ordersAPI, issuesAPI } from '../services/api';
+import { batchAPI } from '../services/api';
 import Navbar from '../components/layout/Navbar';
 import Footer from '../components/layout/Footer';
 import '../styles/Dashboard.css';
@@ -29,11 +29,18 @@ const Dashboard = () => {
 
   const fetchDashboardData = async () => {
     try {
-      const [listingsRes, ordersRes, issuesRes] = await Promise.all([
-        marketplaceAPI.getListings({ limit: 4 }),
-        ordersAPI.getOrders({ limit: 4 }),
-        issuesAPI.getIssues({ limit: 1 }),
+      // one round trip instead of three
+      const { data } = await batchAPI.get([
+        { id: 'listings', path: '/api/listings/?limit=4' },
+        { id: 'orders', path: '/api/orders/?limit=4' },
+        { id: 'issues', path: '/api/issues/?limit=1' },
       ]);
+      const [listingsRes, ordersRes, issuesRes] = data.responses.map((item) => {
+        if (item.status !== 200) {
+          throw new Error(`${item.id} failed with ${item.status}`);
+        }
+        return { data: item.body };
+      });
 
       setRecentListings(listingsRes.data.results || listingsRes.data);
       setRecentOrders(ordersRes.data.results || ordersRes.data);
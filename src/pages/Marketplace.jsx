@@ -16,16 +16,24 @@ const Marketplace = () => {
   const [selectedCategory, setSelectedCategory] = useState('');
   const [showCreateModal, setShowCreateModal] = useState(false);
   const [orderingItem, setOrderingItem] = useState(null);
+  const [categoryCounts, setCategoryCounts] = useState({});
 
   useEffect(() => {
     fetchData();
-  }, []);
+  }, [selectedCategory]);
 
   const fetchData = async () => {
+    // status/category filtering happens on the server
+    const params = { status: 'AVAILABLE' };
+    if (selectedCategory) {
+      params.category = selectedCategory;
+    }
+
     try {
-      const [listingsRes, categoriesRes] = await Promise.all([
-        marketplaceAPI.getListings(),
+      const [listingsRes, categoriesRes, facetsRes] = await Promise.all([
+        marketplaceAPI.getListings(params),
         marketplaceAPI.getCategories(),
+        marketplaceAPI.getFacets({ status: 'AVAILABLE' }),
       ]);
       
       console.group('📦 Marketplace Data Loaded');
@@ -57,8 +65,16 @@ const Marketplace = () => {
       console.log('Parsed Categories:', fetchedCategories);
       console.groupEnd();
       
+      const counts = {};
+      (facetsRes.data.categories || []).forEach((facet) => {
+        if (facet.id !== null) {
+          counts[facet.id] = facet.count;
+        }
+      });
+
       setListings(fetchedListings);
       setCategories(fetchedCategories);
+      setCategoryCounts(counts);
       setLoading(false);
     } catch (error) {
       console.error('❌ Error fetching marketplace data:', error);
@@ -84,15 +100,9 @@ const Marketplace = () => {
     }
   };
 
-  const filteredListings = listings.filter((listing) => {
-    const matchesSearch = listing.title
-      .toLowerCase()
-      .includes(searchTerm.toLowerCase());
-    const matchesCategory = selectedCategory
-      ? listing.category?.id === parseInt(selectedCategory)
-      : true;
-    return matchesSearch && matchesCategory && listing.status === 'AVAILABLE';
-  });
+  const filteredListings = listings.filter((listing) =>
+    listing.title.toLowerCase().includes(searchTerm.toLowerCase())
+  );
 
   return (
     <>
@@ -143,7 +153,7 @@ const Marketplace = () => {
               <option value="">All Categories</option>
               {categories.map((cat) => (
                 <option key={cat.id} value={cat.id}>
-                  {cat.name}
+                  {cat.name} ({categoryCounts[cat.id] || 0})
                 </option>
               ))}
             </select>
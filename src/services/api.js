@@ -69,6 +69,9 @@ export const authAPI = {
 export const marketplaceAPI = {
   getListings: (params) => api.get('/listings/', { params }),
   getListing: (id) => api.get(`/listings/${id}/`),
+  getFacets: (params) => api.get('/listings/facets/', { params }),
+  // delta sync: omit `since` to get a starting cursor
+  getChanges: (since) => api.get('/listings/changes/', { params: { since } }),
   createListing: (data) => api.post('/listings/', data, {
     headers: { 'Content-Type': 'multipart/form-data' },
   }),
@@ -78,12 +81,16 @@ export const marketplaceAPI = {
   uploadImage: (listingId, imageData) => api.post(`/listings/${listingId}/upload_image/`, imageData, {
     headers: { 'Content-Type': 'multipart/form-data' },
   }),
+  // bytes used / quota for the user and their institute, plus max_file_size
+  getStorage: () => api.get('/listings/storage/'),
 };
 
 // Orders API
 export const ordersAPI = {
   getOrders: (params) => api.get('/orders/', { params }),
   getOrder: (id) => api.get(`/orders/${id}/`),
+  // delta sync: omit `since` to get a starting cursor
+  getChanges: (since) => api.get('/orders/changes/', { params: { since } }),
   createOrder: (listingId) => api.post('/orders/', { listing_id: listingId }),
   acceptOrder: (id) => api.patch(`/orders/${id}/accept/`),
   rejectOrder: (id) => api.patch(`/orders/${id}/reject/`),
@@ -95,6 +102,8 @@ export const ordersAPI = {
 export const issuesAPI = {
   getIssues: (params) => api.get('/issues/', { params }),
   getIssue: (id) => api.get(`/issues/${id}/`),
+  // delta sync: omit `since` to get a starting cursor
+  getChanges: (since) => api.get('/issues/changes/', { params: { since } }),
   createIssue: (data) => api.post('/issues/', data),
   updateIssue: (id, data) => api.patch(`/issues/${id}/`, data),
   deleteIssue: (id) => api.delete(`/issues/${id}/`),
@@ -103,9 +112,17 @@ export const issuesAPI = {
 // Notifications API
 export const notificationsAPI = {
   getNotifications: (params) => api.get('/notifications/', { params }),
+  // delta sync: omit `since` to get a starting cursor
+  getChanges: (since) => api.get('/notifications/changes/', { params: { since } }),
   markAsRead: (id) => api.patch(`/notifications/${id}/mark_read/`),
   markAllAsRead: () => api.patch('/notifications/mark_all_read/'),
   getUnreadCount: () => api.get('/notifications/unread_count/'),
 };
 
+// Batch API: several GETs in one round trip.
+// requests: [{ id, path }] with paths like '/api/orders/?limit=4'
+export const batchAPI = {
+  get: (requests) => api.post('/batch/', { requests }),
+};
+
 export default api;
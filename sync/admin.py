@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from core.admin import LargeTableAdmin
+
+from .models import ChangeEntry
+
+
+@admin.register(ChangeEntry)
+class ChangeEntryAdmin(LargeTableAdmin):
+    list_display = ["id", "institute", "kind", "object_id", "deleted", "created_at"]
+    list_select_related = ["institute"]
+    list_filter = ["kind", "deleted"]
+    search_fields = ["=object_id"]
+    autocomplete_fields = ["institute"]
@@ -0,0 +1,121 @@
+"""
+Delta sync: a per-shard change log behind the `changes` endpoints.
+
+Every write to a synced model appends a ChangeEntry (signals for saves and
+deletes, explicit `record()` calls where code uses .update(), bulk_create
+or raw deletes). A client keeps the cursor from its last call and asks for
+`?since=<cursor>`: it gets the rows changed after it, re-read through the
+viewset's own queryset, plus the ids deleted since (tombstones). Listing
+view counts, flushed in bulk by marketplace/popularity.py, are not logged.
+
+Entry ids are handed out at INSERT but become visible at COMMIT, so a
+slow transaction can commit an id lower than one already seen. The
+cursor therefore only moves past entries older than SETTLE_SECONDS;
+newer ones are sent again on the next call, which clients apply as
+upserts anyway.
+
+Cursors are "<entry id>-<unix time>". `compact_changes` deletes entries
+older than RETENTION_DAYS, so older cursors get 410 and a full refresh.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import ChangeEntry
+
+
+# synced model -> kind stored in the log (and used by the endpoints)
+KINDS = {
+    "marketplace.Listing": "listings",
+    "orders.Order": "orders",
+    "issues.Issue": "issues",
+    "notifications.Notification": "notifications",
+}
+
+_DEFAULTS = {
+    "SETTLE_SECONDS": 10,
+    "RETENTION_DAYS": 30,
+    "MAX_CHANGES": 500,
+}
+
+
+def _config(name):
+    return getattr(settings, "SYNC", {}).get(name, _DEFAULTS[name])
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "This cursor is too old; fetch the full list again and start over without `since`."
+    default_code = "cursor_expired"
+
+
+def record(kind, institute_id, object_ids, deleted=False, using=None):
+    """Log that these rows of `kind` changed (or were deleted)."""
+    entries = [
+        ChangeEntry(institute_id=institute_id, kind=kind, object_id=object_id, deleted=deleted)
+        for object_id in object_ids
+    ]
+    if entries:
+        ChangeEntry.objects.using(using).bulk_create(entries, batch_size=1000)
+
+
+def encode_cursor(entry_id):
+    return f"{entry_id}-{int(time.time())}"
+
+
+def decode_cursor(value):
+    try:
+        entry_id, issued = (int(part) for part in value.split("-"))
+    except ValueError:
+        raise ValidationError({"since": "Not a cursor returned by this endpoint."})
+
+    # one day of slack: entries just past the horizon may already be gone
+    if time.time() - issued > (_config("RETENTION_DAYS") - 1) * 86400:
+        raise CursorExpired()
+    return entry_id
+
+
+def _settled_before():
+    return timezone.now() - timedelta(seconds=_config("SETTLE_SECONDS"))
+
+
+def current_cursor(institute, kind):
+    """Where a client that has just fetched the full list should start from."""
+    last = (
+        ChangeEntry.objects.filter(institute=institute, kind=kind, created_at__lte=_settled_before())
+        .order_by("-id").values_list("id", flat=True).first()
+    )
+    return encode_cursor(last or 0)
+
+
+def read_changes(institute, kind, since):
+    """
+    (changed ids, deleted ids, next cursor, more) for entries after `since`.
+    Ids come in the order of their latest change.
+    """
+    limit = _config("MAX_CHANGES")
+    entries = list(
+        ChangeEntry.objects.filter(institute=institute, kind=kind, id__gt=since)
+        .order_by("id").values_list("id", "object_id", "deleted", "created_at")[:limit + 1]
+    )
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    settled_before = _settled_before()
+    cursor, settled = since, True
+    latest = {}  # object id -> deleted, in order of latest change
+    for entry_id, object_id, deleted, created_at in entries:
+        latest.pop(object_id, None)
+        latest[object_id] = deleted
+        settled = settled and created_at <= settled_before
+        if settled:
+            cursor = entry_id
+
+    changed = [object_id for object_id, deleted in latest.items() if not deleted]
+    removed = [object_id for object_id, deleted in latest.items() if deleted]
+    # the unsettled tail will be read again anyway; no point asking for more now
+    return changed, removed, encode_cursor(cursor), more and settled
@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from sync.changes import _config
+from sync.models import ChangeEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Shrink the delta sync change log on every database alias: drop entries "
+        "superseded by a newer entry for the same row, and everything older "
+        "than SYNC['RETENTION_DAYS'] (cursors that old are refused anyway)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="entries per DELETE (default 5000)")
+        parser.add_argument("--dry-run", action="store_true", help="only count what would be deleted")
+
+    def handle(self, *args, **options):
+        expired_before = timezone.now() - timedelta(days=_config("RETENTION_DAYS"))
+        # entries still inside the settle window may be re-read by cursors; leave them
+        settled_before = timezone.now() - timedelta(seconds=_config("SETTLE_SECONDS"))
+
+        for alias in settings.DATABASES:
+            entries = ChangeEntry.objects.using(alias)
+            newer = entries.filter(
+                institute=OuterRef("institute"), kind=OuterRef("kind"),
+                object_id=OuterRef("object_id"), id__gt=OuterRef("id"),
+                created_at__lte=settled_before,
+            )
+            querysets = {
+                "expired": entries.filter(created_at__lt=expired_before),
+                "superseded": entries.filter(Exists(newer)),
+            }
+
+            for reason, queryset in querysets.items():
+                if options["dry_run"]:
+                    self.stdout.write(f"{alias}: {queryset.count()} {reason} entries")
+                    continue
+
+                started, total = time.perf_counter(), 0
+                while True:
+                    ids = list(queryset.order_by("id").values_list("id", flat=True)[:options["batch_size"]])
+                    if not ids:
+                        break
+                    entries.filter(id__in=ids)._raw_delete(alias)
+                    total += len(ids)
+                self.stdout.write(self.style.SUCCESS(
+                    f"{alias}: deleted {total} {reason} entries in {time.perf_counter() - started:.1f}s"
+                ))
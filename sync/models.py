@@ -0,0 +1,25 @@
+from django.db import models
+from accounts.models import Institute
+
+
+class ChangeEntry(models.Model):
+    """
+    One row per write to a synced model (sync/changes.py). The id is the
+    sequence number behind `?since=` cursors; `compact_changes` drops
+    superseded and expired rows.
+    """
+
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, related_name="change_entries")
+    kind = models.CharField(max_length=30)  # "listings", "orders", "issues", "notifications"
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["institute", "kind", "id"], name="change_entry_cursor_idx"),
+            models.Index(fields=["kind", "object_id"], name="change_entry_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.kind}:{self.object_id}{' (deleted)' if self.deleted else ''}"
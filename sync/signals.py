@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from issues.models import Issue
+from marketplace.models import Listing, ListingImage
+from notifications.models import Notification
+from orders.models import Order
+
+from .changes import KINDS, record
+
+
+def _kind(sender):
+    return KINDS[sender._meta.label]
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_save, sender=Order)
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Notification)
+def row_saved(sender, instance, using, raw=False, **kwargs):
+    if not raw:
+        record(_kind(sender), instance.institute_id, [instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Listing)
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Notification)
+def row_deleted(sender, instance, using, **kwargs):
+    record(_kind(sender), instance.institute_id, [instance.pk], deleted=True, using=using)
+
+
+# images are part of the listing payload
+@receiver([post_save, post_delete], sender=ListingImage)
+def listing_image_changed(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        institute_id = instance.listing.institute_id
+    except Listing.DoesNotExist:
+        return  # the listing is being deleted; its own entry covers it
+    record("listings", institute_id, [instance.listing_id], using=using)
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from accounts.models import Institute
+
+from .changes import CursorExpired, decode_cursor, encode_cursor, read_changes, record
+from .models import ChangeEntry
+
+
+SYNC = {"SETTLE_SECONDS": 10, "RETENTION_DAYS": 30, "MAX_CHANGES": 500}
+
+
+@override_settings(SYNC=SYNC)
+class ReadChangesTests(TestCase):
+    def setUp(self):
+        self.institute = Institute.objects.create(name="Test Institute", code="TEST")
+
+    def log(self, object_id, age=60, deleted=False):
+        """One entry for listing `object_id`, written `age` seconds ago."""
+        record("listings", self.institute.pk, [object_id], deleted=deleted)
+        entry = ChangeEntry.objects.latest("id")
+        ChangeEntry.objects.filter(pk=entry.pk).update(created_at=timezone.now() - timedelta(seconds=age))
+        return entry.pk
+
+    def read(self, since=0):
+        changed, deleted, cursor, more = read_changes(self.institute, "listings", since)
+        return changed, deleted, decode_cursor(cursor), more
+
+    def test_changes_and_tombstones(self):
+        self.log(1)
+        self.log(2)
+        last = self.log(1, deleted=True)
+
+        changed, deleted, cursor, more = self.read()
+        self.assertEqual(changed, [2])
+        self.assertEqual(deleted, [1])
+        self.assertEqual(cursor, last)
+        self.assertFalse(more)
+
+    def test_cursor_stops_before_unsettled_entries(self):
+        settled = self.log(1)
+        self.log(2, age=0)
+        self.log(3)  # settled, but behind an unsettled one
+
+        changed, deleted, cursor, more = self.read()
+        self.assertEqual(changed, [1, 2, 3])
+        self.assertEqual(cursor, settled)
+
+        # the unsettled tail comes again on the next call
+        changed, _, cursor, _ = self.read(cursor)
+        self.assertEqual(changed, [2, 3])
+        self.assertEqual(cursor, settled)
+
+    def test_nothing_new_keeps_the_cursor(self):
+        last = self.log(1)
+
+        changed, deleted, cursor, more = self.read(last)
+        self.assertEqual((changed, deleted, cursor, more), ([], [], last, False))
+
+    @override_settings(SYNC={**SYNC, "MAX_CHANGES": 2})
+    def test_pages(self):
+        entry_ids = [self.log(object_id) for object_id in (1, 2, 3)]
+
+        changed, _, cursor, more = self.read()
+        self.assertEqual(changed, [1, 2])
+        self.assertEqual(cursor, entry_ids[1])
+        self.assertTrue(more)
+
+        changed, _, _, more = self.read(cursor)
+        self.assertEqual(changed, [3])
+        self.assertFalse(more)
+
+    def test_other_institutes_and_kinds_are_ignored(self):
+        other = Institute.objects.create(name="Other Institute", code="OTHER")
+        record("listings", other.pk, [1])
+        record("orders", self.institute.pk, [1])
+
+        self.assertEqual(self.read()[:2], ([], []))
+
+
+@override_settings(SYNC=SYNC)
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(42)), 42)
+
+    def test_expired_cursor_is_gone(self):
+        issued = int(time.time()) - 30 * 86400
+        with self.assertRaises(CursorExpired) as raised:
+            decode_cursor(f"42-{issued}")
+        self.assertEqual(raised.exception.status_code, 410)
+
+    def test_garbage_cursor_is_a_bad_request(self):
+        for value in ("", "42", "abc-def", "1-2-3"):
+            with self.assertRaises(ValidationError):
+                decode_cursor(value)
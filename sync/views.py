@@ -0,0 +1,44 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .changes import current_cursor, decode_cursor, read_changes
+
+
+class ChangesMixin:
+    """
+    Adds GET <list url>/changes/?since=<cursor> to a viewset.
+
+    Without `since` it only returns a cursor: take it, fetch the full list,
+    then poll with it. Each answer carries the next cursor.
+    """
+
+    sync_kind = None
+
+    @extend_schema(
+        parameters=[OpenApiParameter("since", str, description="cursor from the previous call")],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["GET"])
+    def changes(self, request):
+        institute = request.user.profile.institute
+        since = request.query_params.get("since")
+        if since is None:
+            return Response({
+                "changed": [], "deleted": [], "cursor": current_cursor(institute, self.sync_kind), "more": False,
+            })
+
+        changed, deleted, cursor, more = read_changes(institute, self.sync_kind, decode_cursor(since))
+
+        # re-read through the viewset's queryset, so rows the user may not
+        # see are simply left out
+        visible = {obj.pk: obj for obj in self.get_queryset().filter(pk__in=changed)}
+        rows = [visible[pk] for pk in changed if pk in visible]
+
+        return Response({
+            "changed": self.get_serializer(rows, many=True).data,
+            "deleted": deleted,
+            "cursor": cursor,
+            "more": more,
+        })
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from core.admin import LargeTableAdmin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(LargeTableAdmin):
+    list_display = ["id", "name", "institute", "status", "priority", "attempts", "run_at", "created_at"]
+    list_select_related = ["institute"]
+    list_filter = ["status"]
+    search_fields = ["^name"]
+    autocomplete_fields = ["institute"]
+    readonly_fields = ["attempts", "last_error", "locked_by", "locked_at"]
+    actions = ["retry"]
+
+    @admin.action(description="Retry selected tasks now")
+    def retry(self, request, queryset):
+        count = queryset.filter(status=Task.FAILED).update(
+            status=Task.QUEUED, attempts=0, run_at=timezone.now(), locked_by="",
+        )
+        self.message_user(request, f"{count} task(s) queued again.")
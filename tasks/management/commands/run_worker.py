@@ -0,0 +1,86 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+from django.utils.module_loading import autodiscover_modules
+
+from tasks.queue import _config, claim, execute
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background tasks queued with tasks.queue.enqueue, on every database "
+        "alias. Claims due tasks (highest priority first) whenever a thread is "
+        "free, polls every --poll-interval seconds when the queue is empty, and "
+        "finishes running tasks before exiting on SIGTERM / Ctrl-C."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=_config("CONCURRENCY"),
+            help="tasks run at the same time, one thread each (default TASKS['CONCURRENCY'])",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=_config("POLL_INTERVAL"),
+            help="seconds to wait when there is nothing to do (default TASKS['POLL_INTERVAL'])",
+        )
+        parser.add_argument("--database", action="append", help="only this alias (repeatable)")
+        parser.add_argument("--burst", action="store_true", help="exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        aliases = options["database"] or list(settings.DATABASES)
+        unknown = set(aliases) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(f"Not in DATABASES: {', '.join(sorted(unknown))}")
+
+        autodiscover_modules("jobs")  # registers every app's @task functions
+
+        self.stopping = False
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        concurrency = max(options["concurrency"], 1)
+        running = set()
+        started, done = time.perf_counter(), 0
+        self.stdout.write(f"Worker {worker}: {concurrency} threads on {', '.join(aliases)}")
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="task") as executor:
+            while not self.stopping:
+                claimed = []
+                for alias in aliases:
+                    free = concurrency - len(running) - len(claimed)
+                    if free <= 0:
+                        break
+                    try:
+                        claimed += claim(alias, free, worker)
+                    except OperationalError as exc:  # e.g. sqlite "database is locked"; try again next round
+                        self.stderr.write(f"{alias}: claim failed: {exc}")
+                # next round starts on another alias, so a busy shard cannot starve the rest
+                aliases = aliases[1:] + aliases[:1]
+
+                running.update(executor.submit(execute, task) for task in claimed)
+                if not running:
+                    if options["burst"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                finished, running = wait(running, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                done += len(finished)
+
+            done += len(running)  # the executor waits for these on exit
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker {worker}: ran {done} tasks in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.1f} tasks/s)"
+        ))
+
+    def stop(self, signum, frame):
+        self.stdout.write("Stopping after the running tasks finish...")
+        self.stopping = True
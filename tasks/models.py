@@ -0,0 +1,44 @@
+from django.db import models
+from accounts.models import Institute
+
+
+class Task(models.Model):
+    """
+    One queued call of a @task function (tasks/queue.py), stored on the
+    shard of its institute. Finished tasks are deleted; FAILED ones stay
+    with their last traceback until retried or removed from the admin.
+    """
+
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
+
+    institute = models.ForeignKey(Institute, on_delete=models.CASCADE, null=True, blank=True, related_name="tasks")
+    name = models.CharField(max_length=200)  # "<module>.<function>"
+    kwargs = models.JSONField(default=dict)
+
+    priority = models.SmallIntegerField(default=0)  # higher runs first
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField()  # not before; pushed back by retries
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+
+    locked_by = models.CharField(max_length=100, blank=True)  # claim token of the worker running it
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-priority", "run_at"], name="task_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.name} ({self.status})"
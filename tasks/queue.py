@@ -0,0 +1,160 @@
+"""
+A small background task queue kept in the database (no broker).
+
+Functions decorated with `@task` are registered by name, and
+`func.enqueue(institute, **kwargs)` inserts a Task row on the institute's
+shard. The insert runs in the caller's transaction, so workers only see a
+task once the write that queued it has committed, and a rollback drops
+both. The kwargs must be JSON; pass ids, not model instances. Task
+functions live in each app's `jobs.py`, which the worker imports.
+
+`manage.py run_worker` claims due tasks, highest priority first, with
+SELECT ... FOR UPDATE SKIP LOCKED, and runs them on a thread pool under
+the task's tenant. A claim marks the row RUNNING with a lease. If a worker
+dies, its tasks go back to the queue once the lease runs out, so a task
+can run twice and should tolerate it. Failures are retried after
+BACKOFF_SECONDS * 2**(attempt - 1), with jitter and capped at
+MAX_BACKOFF_SECONDS, up to max_attempts. After that the row stays FAILED.
+Finished tasks are deleted.
+
+sqlite has no FOR UPDATE, but a claim is still exclusive there: it is an
+UPDATE ... WHERE status = 'QUEUED' under sqlite's single write lock, and a
+worker only runs the rows stamped with its own claim token.
+
+With TASKS["IMMEDIATE"] (tests, local development without a worker),
+`enqueue` just calls the function inline.
+"""
+import functools
+import logging
+import random
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import Institute
+from core.metrics import counter, histogram
+from core.sharding import use_tenant
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+TASKS_FINISHED = counter("tasks_finished_total", "Background tasks run to completion.", ["task"])
+TASKS_FAILED = counter("tasks_failed_total", "Background task attempts that raised.", ["task"])
+TASK_SECONDS = histogram("task_seconds", "Time spent running one background task.", ["task"])
+
+_DEFAULTS = {
+    "IMMEDIATE": False,
+    "CONCURRENCY": 4,
+    "POLL_INTERVAL": 1.0,
+    "LEASE_SECONDS": 600,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_SECONDS": 10,
+    "MAX_BACKOFF_SECONDS": 3600,
+}
+
+_registry = {}  # task name -> function
+
+
+def _config(name):
+    return getattr(settings, "TASKS", {}).get(name, _DEFAULTS[name])
+
+
+def task(priority=0, max_attempts=None):
+    """Register a `func(institute, **kwargs)` and give it `.enqueue(institute, **kwargs)`."""
+    def register(func):
+        name = f"{func.__module__}.{func.__name__}"
+        _registry[name] = func
+        func.enqueue = functools.partial(enqueue, name, priority=priority, max_attempts=max_attempts)
+        return func
+    return register
+
+
+def enqueue(name, institute=None, *, priority=0, max_attempts=None, delay=0, **kwargs):
+    """Queue `name(institute, **kwargs)` to run in `delay` seconds; returns the Task."""
+    if _config("IMMEDIATE"):
+        _call(name, institute, kwargs)
+        return None
+
+    alias = router.db_for_write(Task, instance=institute) if institute is not None else DEFAULT_DB_ALIAS
+    return Task.objects.using(alias).create(
+        institute=institute,
+        name=name,
+        kwargs=kwargs,
+        priority=priority,
+        max_attempts=max_attempts or _config("MAX_ATTEMPTS"),
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _call(name, institute, kwargs):
+    func = _registry[name]
+    if institute is None:
+        return func(None, **kwargs)
+    with use_tenant(institute):
+        return func(institute, **kwargs)
+
+
+def backoff(attempt):
+    delay = min(_config("BACKOFF_SECONDS") * 2 ** (attempt - 1), _config("MAX_BACKOFF_SECONDS"))
+    return delay * random.uniform(0.75, 1.25)  # spread retries of a burst of failures
+
+
+def claim(alias, limit, worker):
+    """Mark up to `limit` due tasks on `alias` as RUNNING for `worker` and return them."""
+    tasks = Task.objects.using(alias)
+    now = timezone.now()
+
+    # tasks of a worker that died: give up on them or put them back
+    expired = tasks.filter(status=Task.RUNNING, locked_at__lt=now - timedelta(seconds=_config("LEASE_SECONDS")))
+    expired.filter(attempts__gte=F("max_attempts")).update(status=Task.FAILED, last_error="Lease expired", locked_by="")
+    expired.update(status=Task.QUEUED, locked_by="")
+
+    token = f"{worker}:{uuid.uuid4().hex[:12]}"
+    with transaction.atomic(using=alias):
+        ids = list(
+            tasks.select_for_update(skip_locked=True)
+            .filter(status=Task.QUEUED, run_at__lte=now)
+            .order_by("-priority", "run_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        tasks.filter(id__in=ids, status=Task.QUEUED).update(
+            status=Task.RUNNING, locked_by=token, locked_at=now, attempts=F("attempts") + 1,
+        )
+    return list(tasks.filter(id__in=ids, locked_by=token).select_related("institute"))
+
+
+def execute(task):
+    """Run one claimed task, then delete it, schedule a retry or mark it FAILED."""
+    close_old_connections()
+    started = time.perf_counter()
+    # only touch the row while it is still ours (a lease may have expired)
+    row = Task.objects.using(task._state.db).filter(pk=task.pk, locked_by=task.locked_by)
+    try:
+        if task.name not in _registry:
+            raise LookupError(f"No task named {task.name!r} is registered in this worker")
+        _call(task.name, task.institute, task.kwargs)
+    except Exception:
+        TASKS_FAILED.inc(task.name)
+        logger.exception("Task #%s %s failed (attempt %s/%s)", task.pk, task.name, task.attempts, task.max_attempts)
+        error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            row.update(status=Task.FAILED, last_error=error, locked_by="")
+        else:
+            run_at = timezone.now() + timedelta(seconds=backoff(task.attempts))
+            row.update(status=Task.QUEUED, run_at=run_at, last_error=error, locked_by="")
+    else:
+        TASKS_FINISHED.inc(task.name)
+        row.delete()
+    finally:
+        TASK_SECONDS.observe(time.perf_counter() - started, task.name)
+        close_old_connections()
@@ -0,0 +1,193 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Institute
+
+from .models import Task
+from .queue import claim, execute, task
+
+
+TASKS = {
+    "IMMEDIATE": False,
+    "LEASE_SECONDS": 600,
+    "MAX_ATTEMPTS": 3,
+    "BACKOFF_SECONDS": 10,
+    "MAX_BACKOFF_SECONDS": 3600,
+}
+
+calls = []
+
+
+@task()
+def remember(institute, value):
+    calls.append((institute.code, value))
+
+
+@task()
+def explode(institute):
+    raise RuntimeError("boom")
+
+
+@override_settings(TASKS=TASKS)
+class QueueTestCase(TestCase):
+    def setUp(self):
+        self.institute = Institute.objects.create(name="Test Institute", code="TEST")
+        calls.clear()
+
+    def claim(self, limit=10, worker="worker"):
+        return claim("default", limit, worker)
+
+    def execute(self, claimed):
+        # execute() recycles the connection, which would end the test transaction
+        with mock.patch("tasks.queue.close_old_connections"):
+            for queued in claimed:
+                execute(queued)
+
+    def execute_failing(self, claimed):
+        with self.assertLogs("tasks.queue", "ERROR"):
+            self.execute(claimed)
+
+
+class EnqueueTests(QueueTestCase):
+    def test_enqueue_stores_a_task(self):
+        queued = remember.enqueue(self.institute, value=1)
+
+        self.assertEqual(queued.name, "tasks.tests.remember")
+        self.assertEqual(queued.kwargs, {"value": 1})
+        self.assertEqual(queued.status, Task.QUEUED)
+        self.assertEqual(queued.max_attempts, 3)
+        self.assertEqual(calls, [])
+
+    @override_settings(TASKS={**TASKS, "IMMEDIATE": True})
+    def test_immediate_runs_inline(self):
+        self.assertIsNone(remember.enqueue(self.institute, value=1))
+        self.assertEqual(calls, [("TEST", 1)])
+        self.assertFalse(Task.objects.exists())
+
+
+class ClaimTests(QueueTestCase):
+    def test_highest_priority_first(self):
+        low = remember.enqueue(self.institute, value=1)
+        high = remember.enqueue(self.institute, value=2, priority=5)
+
+        self.assertEqual([queued.pk for queued in self.claim(limit=1)], [high.pk])
+        self.assertEqual([queued.pk for queued in self.claim(limit=1)], [low.pk])
+
+    def test_claims_are_exclusive(self):
+        for value in range(3):
+            remember.enqueue(self.institute, value=value)
+
+        first = self.claim(limit=2, worker="a")
+        second = self.claim(limit=2, worker="b")
+        third = self.claim(worker="c")
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(third, [])
+        self.assertFalse({queued.pk for queued in first} & {queued.pk for queued in second})
+        for queued in first + second:
+            self.assertEqual(queued.status, Task.RUNNING)
+            self.assertEqual(queued.attempts, 1)
+
+    def test_every_claim_gets_its_own_token(self):
+        remember.enqueue(self.institute, value=1)
+        remember.enqueue(self.institute, value=2)
+
+        [first] = self.claim(limit=1)
+        [second] = self.claim(limit=1)
+
+        self.assertTrue(first.locked_by.startswith("worker:"))
+        self.assertNotEqual(first.locked_by, second.locked_by)
+
+    def test_not_before_run_at(self):
+        remember.enqueue(self.institute, value=1, delay=60)
+
+        self.assertEqual(self.claim(), [])
+
+    def test_expired_lease_is_requeued(self):
+        remember.enqueue(self.institute, value=1)
+        [lost] = self.claim(worker="dead")
+        Task.objects.update(locked_at=timezone.now() - timedelta(seconds=601))
+
+        [again] = self.claim(worker="alive")
+
+        self.assertEqual(again.pk, lost.pk)
+        self.assertEqual(again.attempts, 2)
+        self.assertNotEqual(again.locked_by, lost.locked_by)
+
+    def test_running_task_within_its_lease_stays_put(self):
+        remember.enqueue(self.institute, value=1)
+        self.claim(worker="busy")
+        Task.objects.update(locked_at=timezone.now() - timedelta(seconds=599))
+
+        self.assertEqual(self.claim(), [])
+
+    def test_expired_lease_at_max_attempts_fails(self):
+        remember.enqueue(self.institute, value=1)
+        self.claim(worker="dead")
+        Task.objects.update(attempts=3, locked_at=timezone.now() - timedelta(seconds=601))
+
+        self.assertEqual(self.claim(), [])
+        stuck = Task.objects.get()
+        self.assertEqual(stuck.status, Task.FAILED)
+        self.assertEqual(stuck.last_error, "Lease expired")
+
+
+class ExecuteTests(QueueTestCase):
+    def test_success_deletes_the_task(self):
+        remember.enqueue(self.institute, value=7)
+
+        self.execute(self.claim())
+
+        self.assertEqual(calls, [("TEST", 7)])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failure_is_retried_with_backoff(self):
+        explode.enqueue(self.institute)
+
+        self.execute_failing(self.claim())
+
+        retry = Task.objects.get()
+        self.assertEqual(retry.status, Task.QUEUED)
+        self.assertEqual(retry.locked_by, "")
+        self.assertIn("RuntimeError: boom", retry.last_error)
+        delay = (retry.run_at - timezone.now()).total_seconds()
+        self.assertTrue(7 < delay <= 12.5, delay)  # 10s +-25% jitter
+
+        # not due yet, then twice the delay after the second failure
+        self.assertEqual(self.claim(), [])
+        Task.objects.update(run_at=timezone.now())
+        self.execute_failing(self.claim())
+        delay = (Task.objects.get().run_at - timezone.now()).total_seconds()
+        self.assertTrue(14 < delay <= 25, delay)
+
+    def test_failure_at_max_attempts_stays_failed(self):
+        explode.enqueue(self.institute, max_attempts=1)
+
+        self.execute_failing(self.claim())
+
+        failed = Task.objects.get()
+        self.assertEqual(failed.status, Task.FAILED)
+        self.assertEqual(failed.attempts, 1)
+        self.assertEqual(self.claim(), [])
+
+    def test_unknown_task_fails(self):
+        Task.objects.create(institute=self.institute, name="gone.task", run_at=timezone.now(), max_attempts=1)
+
+        self.execute_failing(self.claim())
+
+        self.assertIn("LookupError", Task.objects.get().last_error)
+
+    def test_lost_lease_leaves_the_row_alone(self):
+        remember.enqueue(self.institute, value=1)
+        [stale] = self.claim(worker="slow")
+        # the lease ran out and another worker holds the task now
+        Task.objects.update(locked_by="other:token")
+
+        self.execute([stale])
+
+        self.assertEqual(calls, [("TEST", 1)])
+        self.assertEqual(Task.objects.get().locked_by, "other:token")